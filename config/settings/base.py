@@ -1,9 +1,11 @@
 # ruff: noqa: ERA001, E501
 """Base settings to build other settings files upon."""
 
+from datetime import timedelta
 from pathlib import Path
 
 import environ
+from celery.schedules import crontab
 from django.utils.translation import gettext_lazy as _
 
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent.parent
@@ -222,6 +224,7 @@ TEMPLATES = [
                 "django.template.context_processors.tz",
                 "django.contrib.messages.context_processors.messages",
                 "langcorrect.users.context_processors.allauth_settings",
+                "langcorrect.users.context_processors.unread_notification_count",
             ],
         },
     },
@@ -321,6 +324,34 @@ CELERY_TASK_TIME_LIMIT = 7 * 60
 CELERY_TASK_SOFT_TIME_LIMIT = 6 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html#beat-entries
+# DatabaseScheduler copies these entries into its periodic tasks on startup.
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-post-language-counts": {
+        "task": "langcorrect.posts.tasks.reconcile_post_language_counts_task",
+        "schedule": crontab(minute=0, hour=3),
+    },
+    "reconcile-post-corrector-counts": {
+        "task": "langcorrect.posts.tasks.reconcile_post_corrector_counts_task",
+        "schedule": crontab(minute=10, hour=3),
+    },
+    "refresh-top-correctors": {
+        "task": "langcorrect.corrections.tasks.refresh_top_correctors_task",
+        "schedule": crontab(minute="*/5"),
+    },
+    "reconcile-daily-contributions": {
+        "task": "langcorrect.contributions.tasks.reconcile_daily_contributions_task",
+        "schedule": crontab(minute=20, hour=3),
+    },
+    "reconcile-unread-notification-counts": {
+        "task": "langcorrect.users.tasks.reconcile_unread_notification_counts_task",
+        "schedule": crontab(minute=30, hour=3),
+    },
+    "prune-notifications": {
+        "task": "langcorrect.users.tasks.prune_notifications_task",
+        "schedule": crontab(minute=40, hour=3),
+    },
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
@@ -379,6 +410,11 @@ ROSETTA_SHOW_AT_ADMIN_PANEL = True
 AVATAR_BASE_URL = "https://ui-avatars.com/api/?rounded=true&length=1&name="
 
 DJANGO_NOTIFICATIONS_CONFIG = {"USE_JSONFIELD": True}
+# Read notifications older than NOTIFICATION_COMPACTION_DAYS are coalesced per
+# action object ("X and 14 others corrected") and notifications older than
+# NOTIFICATION_RETENTION_DAYS are deleted, see prune_notifications_task.
+NOTIFICATION_COMPACTION_DAYS = env.int("NOTIFICATION_COMPACTION_DAYS", default=30)
+NOTIFICATION_RETENTION_DAYS = env.int("NOTIFICATION_RETENTION_DAYS", default=365)
 
 STRIPE_PUBLISHABLE_KEY = env("STRIPE_PUBLISHABLE_KEY")
 STRIPE_SECRET_KEY = env("STRIPE_SECRET_KEY")
@@ -387,3 +423,28 @@ STRIPE_WEBHOOK_SECRET_ENDPOINT = env("STRIPE_WEBHOOK_SECRET_ENDPOINT")
 LANGCORRECT_PREMIUM_YEARLY_PRICE_ID = env("LANGCORRECT_PREMIUM_YEARLY_PRICE_ID")
 
 MINIMUM_CORRECTION_RATIO = env("MINIMUM_CORRECTION_RATIO", default=0.5)
+
+# Send premium users one email listing the corrections they received over the
+# last CORRECTION_EMAIL_DIGEST_MINUTES instead of one email per correction.
+CORRECTION_EMAIL_DIGEST = env.bool("CORRECTION_EMAIL_DIGEST", default=False)
+CORRECTION_EMAIL_DIGEST_MINUTES = env.int("CORRECTION_EMAIL_DIGEST_MINUTES", default=60)
+
+if CORRECTION_EMAIL_DIGEST:
+    CELERY_BEAT_SCHEDULE["send-correction-digests"] = {
+        "task": "langcorrect.corrections.tasks.send_correction_digests_task",
+        "schedule": timedelta(minutes=CORRECTION_EMAIL_DIGEST_MINUTES),
+    }
+
+# Load the NLTK/fugashi/jieba tokenizers when a web or Celery worker boots
+# instead of on the first post save.
+SENTENCE_SPLITTER_WARM_UP = env.bool("SENTENCE_SPLITTER_WARM_UP", default=False)
+
+# Split post sentences in a Celery task after the post is saved instead of
+# inside the request. Rapid successive edits are collapsed into one job that
+# runs ASYNC_SENTENCE_SPLITTING_DELAY seconds after the last edit.
+ASYNC_SENTENCE_SPLITTING = env.bool("ASYNC_SENTENCE_SPLITTING", default=False)
+ASYNC_SENTENCE_SPLITTING_DELAY = env.int("ASYNC_SENTENCE_SPLITTING_DELAY", default=2)
+
+# Paginate the post feed by cursor instead of page number. Cursor links keep
+# working when this is turned off.
+CURSOR_PAGINATION = env.bool("CURSOR_PAGINATION", default=False)
@@ -12,6 +12,8 @@ from rest_framework.authtoken.views import obtain_auth_token
 
 from config.views import index_page_view
 from langcorrect.contributions.views import rankings_list_view
+from langcorrect.corrections.views import export_user_corrections
+from langcorrect.corrections.views import export_user_corrections_status
 from langcorrect.corrections.views import user_corrections_view
 from langcorrect.posts.views import user_posts_view
 from langcorrect.prompts.views import user_prompts_view
@@ -82,6 +84,16 @@ urlpatterns = [
     path("submissions/posts", user_posts_view, name="user_posts"),
     path("submissions/prompts", user_prompts_view, name="user_prompts"),
     path("submissions/corrections", user_corrections_view, name="user_corrections"),
+    path(
+        "submissions/corrections/export",
+        export_user_corrections,
+        name="export_user_corrections",
+    ),
+    path(
+        "submissions/corrections/export/<uuid:job_id>",
+        export_user_corrections_status,
+        name="export_user_corrections_status",
+    ),
     path(
         "journal/<path:subpath>/",
         RedirectView.as_view(url="/journals/%(subpath)s", permanent=True),
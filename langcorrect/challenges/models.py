@@ -1,11 +1,15 @@
 # ruff: noqa: DJ001
 import uuid
+from functools import partial
 
 from django.db import models
 from django.utils.text import slugify
 from model_utils.models import SoftDeletableModel
 from model_utils.models import TimeStampedModel
 
+from langcorrect.utils.slugs import get_next_slug
+from langcorrect.utils.slugs import save_with_unique_slug
+
 
 class Challenge(TimeStampedModel, SoftDeletableModel):
     title = models.CharField(max_length=255)
@@ -13,7 +17,7 @@ class Challenge(TimeStampedModel, SoftDeletableModel):
     url = models.URLField(null=True, blank=True)
     start_date = models.DateTimeField(null=True, blank=True)
     end_date = models.DateTimeField(null=True, blank=True)
-    slug = models.SlugField(max_length=255, null=True)
+    slug = models.SlugField(max_length=255, null=True, unique=True)
     is_active = models.BooleanField(default=False)
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
 
@@ -22,10 +26,15 @@ class Challenge(TimeStampedModel, SoftDeletableModel):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            slug = slugify(self.title, allow_unicode=True)
-            count = 0
-            while Challenge.objects.filter(slug=slug).exists():
-                count = count + 1
-                slug = f"{slug}-{count}"
-            self.slug = slug
-        super().save(*args, **kwargs)
+            return save_with_unique_slug(
+                self,
+                Challenge.all_objects,
+                partial(
+                    get_next_slug,
+                    Challenge.all_objects,
+                    slugify(self.title, allow_unicode=True),
+                ),
+                partial(super().save, *args, **kwargs),
+            )
+
+        return super().save(*args, **kwargs)
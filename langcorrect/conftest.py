@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 
 from langcorrect.users.models import User
@@ -12,3 +14,10 @@ def _media_storage(settings, tmpdir) -> None:
 @pytest.fixture()
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture()
+def _mock_notify():
+    """Stops new posts from queueing follower notifications on commit."""
+    with patch("langcorrect.posts.tasks.notify_followers_of_new_post.delay"):
+        yield
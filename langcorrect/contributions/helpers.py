@@ -1,117 +1,332 @@
-from collections import defaultdict
 from datetime import datetime
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db import transaction
+from django.db.models import Case
 from django.db.models import Count
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
+from django.db.models import Window
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Greatest
+from django.db.models.functions import RowNumber
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from langcorrect.contributions.models import Contribution
+from langcorrect.contributions.models import DailyContribution
 from langcorrect.corrections.models import PostCorrection
 from langcorrect.posts.models import Post
+from langcorrect.prompts.models import Prompt
 
 User = get_user_model()
 
 
-def get_contribution_counts(user_ids=None):
-    user_qs = User.objects.all()
+def _count_by_user(queryset, user_field):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{user_field: OuterRef("user_id")})
+            .order_by()
+            .values(user_field)
+            .annotate(count=Count("id"))
+            .values("count"),
+        ),
+        0,
+    )
 
-    if user_ids is not None:
-        user_qs = user_qs.filter(id__in=user_ids)
 
-    # I tried hitting the db once and recreate the separate dicts, but
-    # the query took significantly longer than just hitting the db 3 times.
+def update_contribution_points(users=None):
+    """
+    Recalculates the contribution counts and points of the given users (or of
+    everyone) inside the database, with one correlated subquery per count.
 
-    user_post_counts = dict(
-        user_qs.annotate(posts=Count("post")).values_list("id", "posts"),
-    )
+    Returns the number of contributions updated.
+    """
+    contributions = Contribution.objects.all()
 
-    user_prompt_counts = dict(
-        user_qs.annotate(prompts=Count("prompt")).values_list("id", "prompts"),
-    )
+    if users is not None:
+        contributions = contributions.filter(user__in=users)
 
-    user_correction_counts = dict(
-        user_qs.annotate(
-            corrections=Count("postusercorrection__corrections"),
-        ).values_list("id", "corrections"),
-    )
-    return user_post_counts, user_prompt_counts, user_correction_counts
+    with transaction.atomic():
+        updated = contributions.update(
+            post_count=_count_by_user(Post.all_objects, "user"),
+            prompt_count=_count_by_user(Prompt.all_objects, "user"),
+            correction_count=_count_by_user(
+                PostCorrection.all_objects,
+                "user_correction__user",
+            ),
+        )
+        # Postgres evaluates SET expressions against the old row, so the total
+        # is summed in a second statement
+        contributions.update(
+            total_points=F("post_count") + F("prompt_count") + F("correction_count"),
+        )
 
+    return updated
 
-def update_contribution_rankings(batch_size=20):
-    contributions = Contribution.objects.all().order_by("-total_points")
-    ranking_updates = []
-    current_rank = 1
 
-    for contribution in contributions.iterator(chunk_size=batch_size):
-        contribution.rank = current_rank
-        ranking_updates.append(contribution)
-        current_rank += 1
+def update_contribution_rankings(batch_size=1000):
+    """
+    Ranks contributions by total points with ROW_NUMBER() in the database and
+    only writes the ranks that changed. Ties are broken by id so unchanged
+    contributions keep their rank between runs.
 
-        if len(ranking_updates) >= batch_size:
-            with transaction.atomic():
-                Contribution.objects.bulk_update(ranking_updates, ["rank"])
-            ranking_updates = []
+    Returns the number of contributions whose rank changed.
+    """
+    changed_ranks = (
+        Contribution.objects.annotate(
+            new_rank=Window(
+                expression=RowNumber(),
+                order_by=[F("total_points").desc(), F("id").asc()],
+            ),
+        )
+        .filter(~Q(rank=F("new_rank")))
+        .values_list("id", "new_rank")
+    )
+    ranking_updates = [
+        Contribution(id=contribution_id, rank=new_rank)
+        for contribution_id, new_rank in changed_ranks
+    ]
+
+    with transaction.atomic():
+        Contribution.objects.bulk_update(
+            ranking_updates,
+            ["rank"],
+            batch_size=batch_size,
+        )
 
-    if ranking_updates:
-        with transaction.atomic():
-            Contribution.objects.bulk_update(ranking_updates, ["rank"])
+    return len(ranking_updates)
 
 
 def get_contribution_data(user):
-    now = timezone.now()
-    start_date = datetime(now.year, 1, 1, tzinfo=timezone.utc)
-    end_date = datetime(now.year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+    daily_contributions = DailyContribution.objects.filter(
+        user=user,
+        date__year=timezone.localdate().year,
+    ).order_by("date")
+
+    return [
+        {"date": daily_contribution.date.isoformat(), "value": daily_contribution.total}
+        for daily_contribution in daily_contributions
+        if daily_contribution.total
+    ]
 
-    contribution_data = defaultdict(int)
 
-    models = [
-        user.post_set,
-        user.prompt_set,
-        PostCorrection.available_objects.filter(user_correction__user=user),
-    ]
+def get_yearly_contribution_count(user):
+    return (
+        DailyContribution.objects.filter(
+            user=user,
+            date__year=timezone.localdate().year,
+        ).aggregate(
+            total=Sum(F("post_count") + F("prompt_count") + F("correction_count")),
+        )["total"]
+        or 0
+    )
 
-    for model in models:
-        aggregated_data = (
-            model.filter(created__range=(start_date, end_date))
-            .annotate(date_only=TruncDate("created"))
-            .values("date_only")
-            .annotate(total=Count("id"))
-        )
 
-        for entry in aggregated_data:
-            contribution_data[entry["date_only"].isoformat()] += entry["total"]
+# Gaps and islands: consecutive post days share the same day - row number, so
+# a user's streak is the size of the island that ends today or yesterday (a
+# streak stays alive until the end of the day after the last post).
+WRITING_STREAKS_SQL = """
+WITH post_days AS (
+    SELECT DISTINCT user_id, created::date AS day
+    FROM posts_post
+    WHERE NOT is_removed
+      AND created < %(tomorrow_start)s
+      AND user_id IN (
+          SELECT user_id
+          FROM posts_post
+          WHERE NOT is_removed
+            AND created >= %(yesterday_start)s
+            AND created < %(tomorrow_start)s
+            {user_filter}
+      )
+),
+islands AS (
+    SELECT
+        user_id,
+        day,
+        day - (ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY day))::integer
+            AS island
+    FROM post_days
+)
+SELECT user_id, COUNT(*), MAX(day)
+FROM islands
+GROUP BY user_id, island
+HAVING MAX(day) >= %(yesterday)s
+"""
+
+
+def get_writing_streaks(user_ids=None):
+    """
+    Returns a {user_id: (writing streak, last post date)} dict, computed in a
+    single query, of the users that have posted today or yesterday. Everyone
+    else has a streak of 0.
+    """
+    today = timezone.localdate()
+    today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    params = {
+        "yesterday": today - timedelta(days=1),
+        "yesterday_start": today_start - timedelta(days=1),
+        "tomorrow_start": today_start + timedelta(days=1),
+    }
+    user_filter = ""
 
-    return [{"date": key, "value": value} for key, value in contribution_data.items()]
+    if user_ids is not None:
+        user_filter = "AND user_id = ANY(%(user_ids)s)"
+        params["user_ids"] = list(user_ids)
 
+    with connection.cursor() as cursor:
+        cursor.execute(WRITING_STREAKS_SQL.format(user_filter=user_filter), params)
+        return {
+            user_id: (streak, last_post_date)
+            for user_id, streak, last_post_date in cursor.fetchall()
+        }
 
-def update_user_writing_streak(user):
-    posts = Post.available_objects.filter(user=user).order_by("-created")
 
-    streak = 0
-    today = timezone.now().date()
-    last_published_date = None
+def update_writing_streaks(user_ids=None):
+    """
+    Recalculates the writing streaks of the given users (or of everyone) with
+    one bulk update for the users that posted today or yesterday and one
+    update resetting everyone whose last post is older than that. Returns the
+    number of contributions updated.
+    """
+    yesterday = timezone.localdate() - timedelta(days=1)
+    streaks = get_writing_streaks(user_ids=user_ids)
 
-    for post in posts.iterator():
-        post_date = post.created.date()
+    contributions = Contribution.objects.all()
 
-        if last_published_date is None:
-            last_published_date = post_date
+    if user_ids is not None:
+        contributions = contributions.filter(user_id__in=user_ids)
+
+    streak_updates = []
+
+    for contribution in contributions.filter(user_id__in=streaks).only(
+        "id",
+        "user_id",
+        "writing_streak",
+        "last_post_date",
+    ):
+        streak, last_post_date = streaks[contribution.user_id]
+
+        if (
+            contribution.writing_streak != streak
+            or contribution.last_post_date != last_post_date
+        ):
+            contribution.writing_streak = streak
+            contribution.last_post_date = last_post_date
+            streak_updates.append(contribution)
+
+    with transaction.atomic():
+        Contribution.objects.bulk_update(
+            streak_updates,
+            ["writing_streak", "last_post_date"],
+            batch_size=1000,
+        )
+        reset_count = (
+            contributions.exclude(writing_streak=0)
+            .filter(
+                Q(last_post_date__lt=yesterday) | Q(last_post_date__isnull=True),
+            )
+            .update(writing_streak=0)
+        )
 
-        if last_published_date == today:
-            streak = 1
+    return len(streak_updates) + reset_count
 
-        if post_date == last_published_date:
-            continue
 
-        if last_published_date - post_date == timedelta(days=1):
-            streak += 1
-        else:
-            break
+def update_user_writing_streak(user):
+    update_writing_streaks(user_ids=[user.id])
+
+
+def increment_user_writing_streak(user, post_date=None):
+    """
+    Updates the writing streak for a post published on post_date (defaults to
+    today) from the last post date alone, without looking at older posts.
+    """
+    if post_date is None:
+        post_date = timezone.localdate()
+
+    Contribution.objects.filter(user=user).update(
+        writing_streak=Case(
+            When(last_post_date=post_date, then=Greatest(F("writing_streak"), 1)),
+            When(
+                last_post_date=post_date - timedelta(days=1),
+                then=F("writing_streak") + 1,
+            ),
+            default=Value(1),
+        ),
+        last_post_date=post_date,
+    )
 
-        last_published_date = post_date
 
-    user.contribution.writing_streak = streak
-    user.contribution.save(update_fields=["writing_streak"])
+def rebuild_daily_contributions(user_ids=None, batch_size=1000):
+    """
+    Rebuilds DailyContribution for the given users (or for everyone) from the
+    source tables, fixing any drift left by writes that bypassed the counters.
+
+    Users are rebuilt batch_size at a time, each batch in its own transaction.
+    The batch's rows are locked before recounting, so adjustments already in
+    flight land first, and the counts are upserted rather than deleted and
+    reinserted. Returns the number of daily contributions written.
+    """
+    if user_ids is None:
+        user_ids = User.objects.order_by("id").values_list("id", flat=True)
+
+    user_ids = list(user_ids)
+    total_written = 0
+
+    for start in range(0, len(user_ids), batch_size):
+        total_written += _rebuild_daily_contributions(
+            user_ids[start : start + batch_size],
+        )
+
+    return total_written
+
+
+def _rebuild_daily_contributions(user_ids):
+    sources = {
+        "post_count": (Post.available_objects.all(), "user_id"),
+        "prompt_count": (Prompt.available_objects.all(), "user_id"),
+        "correction_count": (
+            PostCorrection.available_objects.all(),
+            "user_correction__user_id",
+        ),
+    }
+
+    with transaction.atomic():
+        # Rows that no longer have any source rows are reset to zero
+        daily_counts = {
+            key: {}
+            for key in DailyContribution.objects.select_for_update()
+            .filter(user_id__in=user_ids)
+            .values_list("user_id", "date")
+        }
+
+        for field, (queryset, user_field) in sources.items():
+            rows = (
+                queryset.filter(**{f"{user_field}__in": user_ids})
+                .annotate(date=TruncDate("created"))
+                .order_by()
+                .values_list(user_field, "date")
+                .annotate(count=Count("id"))
+            )
+            for user_id, date, count in rows.iterator():
+                daily_counts.setdefault((user_id, date), {})[field] = count
+
+        DailyContribution.objects.bulk_create(
+            [
+                DailyContribution(user_id=user_id, date=date, **counts)
+                for (user_id, date), counts in daily_counts.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "date"],
+            update_fields=list(sources),
+        )
+
+    return len(daily_counts)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from langcorrect.contributions.helpers import rebuild_daily_contributions
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily contribution rollup from posts, prompts and corrections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of users to rebuild per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        total_written = rebuild_daily_contributions(batch_size=options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Wrote {total_written} daily contribution(s)."),
+        )
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:21
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def populate_correction_counts(apps, schema_editor):
+    PostCorrection = apps.get_model('corrections', 'PostCorrection')
+    DailyContribution = apps.get_model('contributions', 'DailyContribution')
+
+    daily_counts = (
+        PostCorrection.objects.filter(is_removed=False)
+        .annotate(date=TruncDate('created'))
+        .order_by()
+        .values('user_correction__user_id', 'date')
+        .annotate(count=Count('id'))
+    )
+    DailyContribution.objects.bulk_create(
+        [
+            DailyContribution(
+                user_id=row['user_correction__user_id'],
+                date=row['date'],
+                correction_count=row['count'],
+            )
+            for row in daily_counts.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('corrections', '0010_postcorrection_correction_html_and_more'),
+        ('contributions', '0006_remove_contribution_is_removed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('correction_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='contributio_date_e040f7_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailycontribution',
+            constraint=models.UniqueConstraint(fields=('user', 'date'), name='unique_daily_contribution'),
+        ),
+        migrations.RunPython(populate_correction_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:02
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import TruncDate
+
+
+def populate_last_post_dates(apps, schema_editor):
+    Contribution = apps.get_model('contributions', 'Contribution')
+    Post = apps.get_model('posts', 'Post')
+
+    last_post_dates = (
+        Post.objects.filter(user=OuterRef('user_id'), is_removed=False)
+        .order_by()
+        .values('user')
+        .annotate(last_post_date=Max(TruncDate('created')))
+        .values('last_post_date')
+    )
+    Contribution.objects.update(last_post_date=Subquery(last_post_dates))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_corrector_count'),
+        ('contributions', '0007_dailycontribution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contribution',
+            name='last_post_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_last_post_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:40
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_post_and_prompt_counts(apps, schema_editor):
+    DailyContribution = apps.get_model('contributions', 'DailyContribution')
+    sources = {
+        'post_count': apps.get_model('posts', 'Post'),
+        'prompt_count': apps.get_model('prompts', 'Prompt'),
+    }
+
+    for field, model in sources.items():
+        daily_counts = (
+            model.objects.filter(is_removed=False)
+            .annotate(date=TruncDate('created'))
+            .order_by()
+            .values('user_id', 'date')
+            .annotate(count=Count('id'))
+        )
+        DailyContribution.objects.bulk_create(
+            [
+                DailyContribution(
+                    user_id=row['user_id'],
+                    date=row['date'],
+                    **{field: row['count']},
+                )
+                for row in daily_counts.iterator()
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['user', 'date'],
+            update_fields=[field],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_corrector_count'),
+        ('prompts', '0003_prompt_uuid'),
+        ('contributions', '0008_contribution_last_post_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailycontribution',
+            name='post_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='dailycontribution',
+            name='prompt_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(populate_post_and_prompt_counts, migrations.RunPython.noop),
+    ]
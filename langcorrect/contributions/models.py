@@ -15,6 +15,7 @@ class Contribution(TimeStampedModel):
     prompt_count = models.IntegerField(default=0)
     rank = models.IntegerField(default=0)
     writing_streak = models.IntegerField(default=0)
+    last_post_date = models.DateField(null=True, blank=True)
 
     @property
     def get_average_per_day(self):
@@ -28,3 +29,51 @@ class Contribution(TimeStampedModel):
             average = 0
 
         return f"{round(average, 2):.2f}"
+
+
+class DailyContribution(models.Model):
+    """
+    Number of posts, prompts and corrections (not removed) a user made per day,
+    bucketed by the day they were created. Backs the contribution heatmap and
+    the top correctors leaderboards.
+
+    Kept up to date by adjust_daily_contributions and rebuilt from the source
+    tables by rebuild_daily_contributions.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    date = models.DateField()
+    post_count = models.IntegerField(default=0)
+    prompt_count = models.IntegerField(default=0)
+    correction_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "date"],
+                name="unique_daily_contribution",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} on {self.date}"
+
+    @property
+    def total(self):
+        return self.post_count + self.prompt_count + self.correction_count
+
+
+def adjust_daily_contributions(user_id, field, deltas):
+    """Applies {date: delta} changes to one of the user's daily counts."""
+    for date, delta in deltas.items():
+        if not delta:
+            continue
+
+        counters = DailyContribution.objects.filter(user_id=user_id, date=date)
+
+        if not counters.update(**{field: models.F(field) + delta}):
+            DailyContribution.objects.get_or_create(user_id=user_id, date=date)
+            counters.update(**{field: models.F(field) + delta})
@@ -1,13 +1,23 @@
 # ruff: noqa: PT009
 from datetime import timedelta
 
+import pytest
 from django.test import TestCase
 from django.utils import timezone
 
+from langcorrect.contributions.helpers import get_contribution_data
+from langcorrect.contributions.helpers import get_yearly_contribution_count
+from langcorrect.contributions.helpers import increment_user_writing_streak
+from langcorrect.contributions.helpers import rebuild_daily_contributions
+from langcorrect.contributions.helpers import update_contribution_points
+from langcorrect.contributions.helpers import update_contribution_rankings
 from langcorrect.contributions.helpers import update_user_writing_streak
+from langcorrect.contributions.helpers import update_writing_streaks
 from langcorrect.contributions.models import Contribution
+from langcorrect.contributions.models import DailyContribution
 from langcorrect.languages.models import Language
 from langcorrect.posts.models import Post
+from langcorrect.prompts.models import Prompt
 from langcorrect.users.tests.factories import UserFactory
 
 
@@ -100,3 +110,222 @@ class TestWritingStreaks(TestCase):
         update_user_writing_streak(self.user)
         self.contribution.refresh_from_db()
         self.assertEqual(self.contribution.writing_streak, thirty_days)
+
+    def test_old_streak_is_reset(self):
+        """
+        Test that a streak that ended before today is reset to 0.
+        """
+        self.create_post(days_ago=5)
+        self.create_post(days_ago=6)
+        Contribution.objects.filter(id=self.contribution.id).update(writing_streak=2)
+        update_user_writing_streak(self.user)
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 0)
+
+    def test_updates_all_users(self):
+        """
+        Test that the streaks of all users are calculated at once.
+        """
+        other_user = UserFactory()
+        other_contribution, _ = Contribution.objects.get_or_create(user=other_user)
+        self.create_post(days_ago=0)
+        self.create_post(days_ago=1)
+        Post.objects.create(user=other_user, language=self.en_lang)
+
+        update_writing_streaks()
+
+        self.contribution.refresh_from_db()
+        other_contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 2)
+        self.assertEqual(other_contribution.writing_streak, 1)
+        self.assertEqual(self.contribution.last_post_date, timezone.localdate())
+
+    def test_streak_from_yesterday_survives_job(self):
+        """
+        Test that a streak ending yesterday is kept by the scheduled job, so
+        posting today extends it instead of starting over.
+        """
+        self.create_post(days_ago=1)
+        increment_user_writing_streak(
+            self.user,
+            post_date=timezone.localdate() - timedelta(days=1),
+        )
+
+        update_writing_streaks()
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 1)
+
+        self.create_post(days_ago=0)
+        increment_user_writing_streak(self.user)
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 2)
+
+    def test_incremental_streak(self):
+        """
+        Test that the streak is extended from the last post date alone.
+        """
+        today = timezone.localdate()
+
+        increment_user_writing_streak(self.user, post_date=today - timedelta(days=2))
+        increment_user_writing_streak(self.user, post_date=today - timedelta(days=1))
+        increment_user_writing_streak(self.user, post_date=today)
+        increment_user_writing_streak(self.user, post_date=today)
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 3)
+
+        increment_user_writing_streak(self.user, post_date=today + timedelta(days=2))
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.writing_streak, 1)
+
+
+class TestContributionPoints(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.contribution, _ = Contribution.objects.get_or_create(user=self.user)
+        self.other_contribution, _ = Contribution.objects.get_or_create(
+            user=self.other_user,
+        )
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+
+    def test_counts_and_points(self):
+        for i in range(3):
+            Post.objects.create(
+                user=self.user,
+                language=self.en_lang,
+                title=f"Post {i}",
+                text="I woke up.",
+            )
+        Prompt.objects.create(
+            user=self.user,
+            language=self.en_lang,
+            content="Describe your day.",
+        )
+
+        updated = update_contribution_points()
+
+        self.assertEqual(updated, 2)
+        self.contribution.refresh_from_db()
+        self.assertEqual(self.contribution.post_count, 3)
+        self.assertEqual(self.contribution.prompt_count, 1)
+        self.assertEqual(self.contribution.correction_count, 0)
+        self.assertEqual(self.contribution.total_points, 4)
+        self.other_contribution.refresh_from_db()
+        self.assertEqual(self.other_contribution.total_points, 0)
+
+    def test_only_updates_given_users(self):
+        Post.objects.create(
+            user=self.other_user,
+            language=self.en_lang,
+            title="My day",
+            text="I woke up.",
+        )
+
+        update_contribution_points(users=[self.user])
+
+        self.other_contribution.refresh_from_db()
+        self.assertEqual(self.other_contribution.total_points, 0)
+
+
+class TestContributionRankings(TestCase):
+    def setUp(self):
+        self.contributions = [
+            Contribution.objects.get_or_create(user=UserFactory())[0] for _ in range(3)
+        ]
+
+    def set_points(self, *points):
+        for contribution, total_points in zip(self.contributions, points, strict=True):
+            contribution.total_points = total_points
+            contribution.save(update_fields=["total_points"])
+
+    def get_ranks(self):
+        for contribution in self.contributions:
+            contribution.refresh_from_db()
+        return [contribution.rank for contribution in self.contributions]
+
+    def test_ranks_by_total_points(self):
+        self.set_points(5, 20, 10)
+
+        self.assertEqual(update_contribution_rankings(), 3)
+        self.assertEqual(self.get_ranks(), [3, 1, 2])
+
+    def test_only_writes_changed_ranks(self):
+        self.set_points(5, 20, 10)
+        update_contribution_rankings()
+
+        self.set_points(5, 20, 30)
+
+        self.assertEqual(update_contribution_rankings(), 2)
+        self.assertEqual(self.get_ranks(), [3, 2, 1])
+        self.assertEqual(update_contribution_rankings(), 0)
+
+
+class TestDailyContributions(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+
+    def create_post(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(
+                user=self.user,
+                language=self.en_lang,
+                title="My day",
+                text="I woke up.",
+            )
+
+    def create_prompt(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Prompt.objects.create(
+                user=self.user,
+                language=self.en_lang,
+                content="Describe your day.",
+            )
+
+    @pytest.mark.usefixtures("_mock_notify")
+    def test_counts_follow_post_lifecycle(self):
+        post = self.create_post()
+        self.create_post()
+        self.create_prompt()
+
+        today = timezone.localdate().isoformat()
+        self.assertEqual(
+            get_contribution_data(self.user),
+            [{"date": today, "value": 3}],
+        )
+        self.assertEqual(get_yearly_contribution_count(self.user), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(get_yearly_contribution_count(self.user), 2)
+
+    def test_counts_follow_prompt_soft_deletes(self):
+        prompt = self.create_prompt()
+        self.assertEqual(get_yearly_contribution_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prompt.delete()
+        self.assertEqual(get_yearly_contribution_count(self.user), 0)
+
+        prompt = Prompt.all_objects.get(id=prompt.id)
+        prompt.is_removed = False
+        with self.captureOnCommitCallbacks(execute=True):
+            prompt.save()
+        self.assertEqual(get_yearly_contribution_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            prompt.delete(soft=False)
+        self.assertEqual(get_yearly_contribution_count(self.user), 0)
+
+    @pytest.mark.usefixtures("_mock_notify")
+    def test_rebuild_fixes_drift(self):
+        self.create_post()
+        DailyContribution.objects.update(post_count=10, prompt_count=3)
+
+        # Only the given users are rebuilt
+        rebuild_daily_contributions(user_ids=[UserFactory().id])
+        self.assertEqual(get_yearly_contribution_count(self.user), 13)
+
+        rebuild_daily_contributions()
+
+        self.assertEqual(get_yearly_contribution_count(self.user), 1)
@@ -0,0 +1,38 @@
+# ruff: noqa: PT009
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestGetContributions(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.url = f"/api/v1/contributions/{self.user.username}/"
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("max-age", response["Cache-Control"])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+
+class TestRankingListView(TestCase):
+    def setUp(self):
+        cache.clear()
+        UserFactory.create_batch(3)
+
+    def test_count_is_cached(self):
+        self.assertEqual(self.client.get(reverse("rankings")).status_code, 200)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("rankings"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["paginator"].count, 3)
+        self.assertFalse(any("COUNT(" in query["sql"] for query in context))
@@ -1,6 +1,16 @@
+import hashlib
+import json
+from functools import partial
+
 from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.utils.cache import patch_cache_control
+from django.utils.functional import cached_property
+from django.utils.http import parse_etags
+from django.utils.http import quote_etag
 from django.views.generic import ListView
 from rest_framework import permissions
+from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.decorators import permission_classes
 from rest_framework.generics import get_object_or_404
@@ -8,21 +18,70 @@ from rest_framework.response import Response
 
 from langcorrect.contributions.helpers import get_contribution_data
 from langcorrect.contributions.models import Contribution
+from langcorrect.utils.caching import get_cached
 
 User = get_user_model()
 
+CONTRIBUTIONS_MAX_AGE = 60 * 5
+
+# Ranks are only recalculated every few hours by calculate_contribution_points
+RANKINGS_CACHE_TIMEOUT = 60 * 10
+
 
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 def get_contributions(request, username):
     user = get_object_or_404(User, username=username)
     data = get_contribution_data(user)
-    return Response(data=data)
+
+    etag = quote_etag(
+        hashlib.sha1(
+            json.dumps(data).encode(),
+            usedforsecurity=False,
+        ).hexdigest(),
+    )
+
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data=data)
+
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=CONTRIBUTIONS_MAX_AGE)
+    return response
+
+
+class RankingPaginator(Paginator):
+    """Caches the number of rankings, which is a COUNT(*) of every user."""
+
+    @cached_property
+    def count(self):
+        return get_cached(
+            "contribution_rankings_count",
+            self.object_list.count,
+            timeout=RANKINGS_CACHE_TIMEOUT,
+        )
 
 
 class RankingListView(ListView):
     model = Contribution
     paginate_by = 100
+    paginator_class = RankingPaginator
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("user")
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super().paginate_queryset(
+            queryset,
+            page_size,
+        )
+        page.object_list = get_cached(
+            f"contribution_rankings_{page_size}_{page.number}",
+            partial(list, object_list),
+            timeout=RANKINGS_CACHE_TIMEOUT,
+        )
+        return paginator, page, page.object_list, is_paginated
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -3,3 +3,9 @@ class FileFormat:
     CSV = "CSV"
     PDF = "PDF"
     JSON = "JSON"
+
+
+class ExportStatus:
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
@@ -1,18 +1,26 @@
+from collections import Counter
+from collections import defaultdict
 from datetime import datetime
 from datetime import timedelta
+from functools import partial
 from typing import Literal
 
-from django.core.cache import cache
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import F
 from django.db.models import Prefetch
+from django.db.models import Sum
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
+from langcorrect.contributions.models import DailyContribution
+from langcorrect.contributions.models import adjust_daily_contributions
 from langcorrect.corrections.models import PostCorrection
 from langcorrect.corrections.models import PostUserCorrection
 from langcorrect.posts.models import Post
 from langcorrect.posts.models import PostRow
 from langcorrect.users.models import User
+from langcorrect.utils.caching import get_cached
+from langcorrect.utils.caching import refresh_cached
 
 start_dates = {
     "daily": lambda: timezone.now() - timedelta(days=1),
@@ -21,6 +29,50 @@ start_dates = {
     "all_time": lambda: None,
 }
 
+TOP_CORRECTORS_CACHE_TIMEOUT = 60 * 5
+
+
+CORRECTION_UPSERT_FIELDS = [
+    "is_removed",
+    "feedback_type",
+    "correction",
+    "note",
+    "correction_html",
+    "correction_html_digest",
+]
+
+
+def _get_correction_values(
+    post_row: PostRow,
+    feedback_type: Literal["perfect", "corrected"],
+    correction: str = "",
+    note: str = "",
+) -> dict:
+    if feedback_type == PostCorrection.FeedbackType.PERFECT:
+        return {
+            "is_removed": False,
+            "feedback_type": feedback_type,
+            "correction": "",
+            "note": "",
+            "correction_html": "",
+            "correction_html_digest": "",
+        }
+
+    return {
+        "is_removed": False,
+        "feedback_type": feedback_type,
+        "correction": correction,
+        "note": note,
+        "correction_html": PostCorrection.build_correction_html(
+            post_row.sentence,
+            correction,
+        ),
+        "correction_html_digest": PostCorrection.get_correction_digest(
+            post_row.sentence,
+            correction,
+        ),
+    }
+
 
 def create_or_update_correction(
     user_correction: PostUserCorrection,
@@ -29,29 +81,90 @@ def create_or_update_correction(
     correction: str = "",
     note: str = "",
 ) -> PostCorrection:
-    post_correction, _ = PostCorrection.all_objects.update_or_create(
+    bulk_create_or_update_corrections(
+        user_correction,
+        [(post_row, feedback_type, correction, note)],
+    )
+
+    return PostCorrection.available_objects.get(
         user_correction=user_correction,
         post_row=post_row,
-        defaults={
-            "is_removed": False,
-            "feedback_type": feedback_type,
-            "correction": ""
-            if feedback_type == PostCorrection.FeedbackType.PERFECT
-            else correction,
-            "note": ""
-            if feedback_type == PostCorrection.FeedbackType.PERFECT
-            else note,
-        },
     )
 
-    return post_correction
+
+def bulk_create_or_update_corrections(
+    user_correction: PostUserCorrection,
+    entries: list[tuple[PostRow, str, str, str]],
+) -> list[PostCorrection]:
+    """
+    Upserts many corrections for the same user correction in a single query.
+
+    Each entry is a (post_row, feedback_type, correction, note) tuple and post
+    rows must be unique. Soft deleted corrections are revived, the same as
+    create_or_update_correction.
+    """
+    post_corrections = [
+        PostCorrection(
+            user_correction=user_correction,
+            post_row=post_row,
+            **_get_correction_values(post_row, feedback_type, correction, note),
+        )
+        for post_row, feedback_type, correction, note in entries
+    ]
+
+    if not post_corrections:
+        return []
+
+    # Only new and revived corrections count towards the leaderboards, so
+    # look at the current state of the rows before overwriting it
+    existing = {
+        post_row_id: (is_removed, created)
+        for post_row_id, is_removed, created in PostCorrection.all_objects.filter(
+            user_correction=user_correction,
+            post_row_id__in=[entry[0].id for entry in entries],
+        ).values_list("post_row_id", "is_removed", "created")
+    }
+
+    deltas = Counter()
+    for post_correction in post_corrections:
+        state = existing.get(post_correction.post_row_id)
+        if state is None:
+            deltas[timezone.localdate()] += 1
+        elif state[0]:
+            deltas[timezone.localdate(state[1])] += 1
+
+    post_corrections = PostCorrection.all_objects.bulk_create(
+        post_corrections,
+        update_conflicts=True,
+        unique_fields=["post_row", "user_correction"],
+        update_fields=[*CORRECTION_UPSERT_FIELDS, "modified"],
+    )
+    adjust_daily_contributions(user_correction.user_id, "correction_count", deltas)
+
+    return post_corrections
 
 
 def delete_correction(user_correction: PostUserCorrection, post_row: PostRow) -> None:
-    PostCorrection.available_objects.filter(
+    bulk_delete_corrections(user_correction, [post_row.id])
+
+
+def bulk_delete_corrections(
+    user_correction: PostUserCorrection,
+    post_row_ids: list[int],
+) -> None:
+    if not post_row_ids:
+        return
+
+    corrections = PostCorrection.available_objects.filter(
         user_correction=user_correction,
-        post_row=post_row,
-    ).delete()
+        post_row_id__in=post_row_ids,
+    )
+    deltas = Counter()
+    for created in corrections.values_list("created", flat=True):
+        deltas[timezone.localdate(created)] -= 1
+
+    corrections.delete()
+    adjust_daily_contributions(user_correction.user_id, "correction_count", deltas)
 
 
 def get_overall_feedback(post: Post, user: User) -> str | None:
@@ -119,20 +232,26 @@ def get_post_rows(post: Post) -> QuerySet[PostRow]:
     )
 
 
-def get_corrected_sentence(post_row: PostRow, user: User) -> PostCorrection | None:
-    try:
-        return PostCorrection.available_objects.get(
-            post_row=post_row,
-            user_correction__user=user,
-        )
-    except PostCorrection.DoesNotExist:
-        return None
+def get_corrected_sentences(post: Post, user: User) -> dict[int, PostCorrection]:
+    """
+    Returns the user's corrections on the post keyed by post_row_id, so
+    callers can look them up per sentence without extra queries.
+    """
+    corrections = PostCorrection.available_objects.filter(
+        post_row__post=post,
+        user_correction__user=user,
+    )
+    return {correction.post_row_id: correction for correction in corrections}
 
 
 def get_post_user_corrections(post: Post) -> QuerySet[PostUserCorrection]:
-    post_correction_qs = PostCorrection.objects.filter(
-        user_correction__post=post,
-    ).order_by("post_row__order")
+    post_correction_qs = (
+        PostCorrection.objects.filter(
+            user_correction__post=post,
+        )
+        .select_related("post_row")
+        .order_by("post_row__order")
+    )
     return (
         PostUserCorrection.available_objects.filter(post=post)
         .select_related("user")
@@ -145,40 +264,124 @@ def get_top_correctors(period: Literal["daily", "weekly", "monthly", "all_time"]
         msg = "Invalid time period."
         raise ValueError(msg)
 
-    cache_key = f"top_correctors_{period}"
-    top_correctors = cache.get(cache_key)
+    # Stale leaderboards are served while a worker rebuilds them
+    return get_cached(
+        f"top_correctors_{period}",
+        partial(compute_top_correctors, period),
+        timeout=TOP_CORRECTORS_CACHE_TIMEOUT,
+        refresh_async=partial(_queue_top_correctors_refresh, period),
+    )
+
+
+def _queue_top_correctors_refresh(period):
+    """
+    Queues the leaderboard refresh once the request's transaction commits. A
+    broker outage is logged instead of failing the page, which still has the
+    stale leaderboard to show.
+    """
+    from langcorrect.corrections.tasks import refresh_top_correctors_task
+
+    def refresh():
+        refresh_top_correctors_task.delay(period)
+
+    transaction.on_commit(refresh, robust=True)
+
+
+def refresh_top_correctors(period: Literal["daily", "weekly", "monthly", "all_time"]):
+    return refresh_cached(
+        f"top_correctors_{period}",
+        partial(compute_top_correctors, period),
+        timeout=TOP_CORRECTORS_CACHE_TIMEOUT,
+    )
 
-    if top_correctors is not None:
-        return top_correctors
 
+def compute_top_correctors(period: Literal["daily", "weekly", "monthly", "all_time"]):
+    """
+    Computes a leaderboard from the daily contributions. Periods are rounded
+    to whole days.
+    """
     start_date = start_dates.get(period)()
-    corrections = PostCorrection.available_objects.all()
+    daily_counts = DailyContribution.objects.all()
 
     if start_date:
-        corrections = corrections.filter(created__gte=start_date)
+        daily_counts = daily_counts.filter(date__gte=timezone.localdate(start_date))
 
     top_correctors = (
-        corrections.values(
-            "user_correction__user__username",
-            "user_correction__user__nick_name",
+        daily_counts.values(
+            "user__username",
+            "user__nick_name",
         )
         .annotate(
-            correction_count=Count("id"),
+            total_corrections=Sum("correction_count"),
+        )
+        .filter(total_corrections__gt=0)
+        .order_by("-total_corrections")[:10]
+    )
+
+    # Keeps the keys the popular correctors template expects
+    return [
+        {
+            "user_correction__user__username": row["user__username"],
+            "user_correction__user__nick_name": row["user__nick_name"],
+            "correction_count": row["total_corrections"],
+        }
+        for row in top_correctors
+    ]
+
+
+def get_corrected_posts_by_author(since, until) -> dict[User, list[tuple]]:
+    """
+    Returns the posts that got new or updated corrections between since and
+    until, grouped by author, as (post, corrector display names) tuples.
+
+    Authors whose last digest failed to send get the corrections since their
+    correction_digest_retry_since instead, when that is earlier.
+    """
+    corrections = PostCorrection.available_objects.filter(modified__lt=until)
+    corrections = (
+        corrections.filter(modified__gte=since)
+        .order_by()
+        .values_list("post_row__post_id", "user_correction__user_id")
+        .union(
+            corrections.filter(
+                modified__gte=F("post_row__post__user__correction_digest_retry_since"),
+            )
+            .order_by()
+            .values_list("post_row__post_id", "user_correction__user_id"),
         )
-        .order_by("-correction_count")[:10]
     )
 
-    top_correctors = list(top_correctors)
-    cache.set(cache_key, top_correctors, timeout=60 * 5)
+    corrector_ids_by_post = defaultdict(set)
+    for post_id, corrector_id in corrections:
+        corrector_ids_by_post[post_id].add(corrector_id)
+
+    if not corrector_ids_by_post:
+        return {}
+
+    correctors = User.objects.in_bulk(set().union(*corrector_ids_by_post.values()))
+    posts = (
+        Post.available_objects.filter(id__in=corrector_ids_by_post)
+        .select_related("user__stripecustomer")
+        .order_by("created")
+    )
+
+    corrected_posts = defaultdict(list)
+    for post in posts:
+        corrector_names = sorted(
+            correctors[corrector_id].display_name
+            for corrector_id in corrector_ids_by_post[post.id]
+            if corrector_id in correctors
+        )
+        corrected_posts[post.user].append((post, corrector_names))
 
-    return top_correctors
+    return corrected_posts
 
 
 def check_can_make_corrections(current_user, post):
     if post.user == current_user:
         return False
 
-    if post.language not in current_user.native_languages:
+    if post.language_id not in current_user.native_language_ids:
         return False
 
     return True
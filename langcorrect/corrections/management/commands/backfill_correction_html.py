@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from langcorrect.corrections.models import PostCorrection
+
+
+class Command(BaseCommand):
+    help = "Precompute the rendered diff HTML for existing corrections."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of corrections to read and write per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        corrections = (
+            PostCorrection.all_objects.select_related("post_row")
+            .only(
+                "id",
+                "feedback_type",
+                "correction",
+                "correction_html",
+                "correction_html_digest",
+                "post_row__sentence",
+            )
+            .order_by("id")
+        )
+
+        updates = []
+        total_updated = 0
+
+        for post_correction in corrections.iterator(chunk_size=batch_size):
+            if post_correction.render_correction_html():
+                updates.append(post_correction)
+
+            if len(updates) >= batch_size:
+                total_updated += self._flush(updates)
+                updates = []
+
+        if updates:
+            total_updated += self._flush(updates)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated {total_updated} correction(s)."),
+        )
+
+    def _flush(self, updates):
+        with transaction.atomic():
+            PostCorrection.all_objects.bulk_update(
+                updates,
+                ["correction_html", "correction_html_digest"],
+            )
+        return len(updates)
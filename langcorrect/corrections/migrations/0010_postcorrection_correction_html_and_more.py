@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('corrections', '0009_comment_uuid_postcorrection_uuid_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postcorrection',
+            name='correction_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='postcorrection',
+            name='correction_html_digest',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+    ]
@@ -1,4 +1,5 @@
 # ruff: noqa: DJ001
+import hashlib
 import uuid
 
 from django.conf import settings
@@ -63,6 +64,48 @@ class PostCorrection(TimeStampedModel, SoftDeletableModel):
     correction_types = models.ManyToManyField(CorrectionType, blank=True)
     feedback_type = models.CharField(max_length=10, choices=FeedbackType.choices)
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
+    # Rendered diff of post_row.sentence -> correction, keyed by a digest of both
+    # so that a stale value is never served after either side changes.
+    correction_html = models.TextField(default="", blank=True, editable=False)
+    correction_html_digest = models.CharField(
+        max_length=40,
+        default="",
+        blank=True,
+        editable=False,
+    )
+
+    @staticmethod
+    def get_correction_digest(sentence, correction):
+        payload = f"{sentence}\x00{correction}".encode()
+        return hashlib.sha1(payload, usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def build_correction_html(sentence, correction):
+        dmp = diff_match_patch.diff_match_patch()
+        diffs = dmp.diff_main(sentence, correction)
+        dmp.diff_cleanupSemantic(diffs)
+        return dmp.diff_prettyHtml(diffs)
+
+    def render_correction_html(self, sentence=None):
+        """
+        Computes the diff for this correction and stores it on the instance
+        (without saving). Returns True if the stored value changed.
+        """
+        if sentence is None:
+            sentence = self.post_row.sentence
+
+        if self.feedback_type != self.FeedbackType.CORRECTED:
+            html, digest = "", ""
+        else:
+            digest = self.get_correction_digest(sentence, self.correction)
+            if digest == self.correction_html_digest:
+                return False
+            html = self.build_correction_html(sentence, self.correction)
+
+        changed = (html, digest) != (self.correction_html, self.correction_html_digest)
+        self.correction_html = html
+        self.correction_html_digest = digest
+        return changed
 
     def clean(self):
         if self.feedback_type == self.FeedbackType.PERFECT:
@@ -92,12 +135,14 @@ class PostCorrection(TimeStampedModel, SoftDeletableModel):
 
     @property
     def display_correction(self):
+        sentence = self.post_row.sentence
         if self.feedback_type != self.FeedbackType.CORRECTED:
-            return self.post_row.sentence
-        dmp = diff_match_patch.diff_match_patch()
-        diffs = dmp.diff_main(self.post_row.sentence, self.correction)
-        dmp.diff_cleanupSemantic(diffs)
-        return dmp.diff_prettyHtml(diffs)
+            return sentence
+
+        digest = self.get_correction_digest(sentence, self.correction)
+        if self.correction_html and self.correction_html_digest == digest:
+            return self.correction_html
+        return self.build_correction_html(sentence, self.correction)
 
 
 class Comment(TimeStampedModel, SoftDeletableModel):
@@ -0,0 +1,155 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from config import celery_app
+from langcorrect.corrections.helpers import get_corrected_posts_by_author
+from langcorrect.corrections.helpers import refresh_top_correctors
+from langcorrect.corrections.helpers import start_dates
+from langcorrect.corrections.utils import BulkExportCorrections
+from langcorrect.corrections.utils import ExportCorrections
+from langcorrect.posts.models import Post
+from langcorrect.users.models import User
+from langcorrect.utils.mailing import EmailSender
+from langcorrect.utils.mailing import build_correction_digest_email
+from langcorrect.utils.mailing import email_new_correction
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE = 100
+CORRECTION_DIGEST_LAST_RUN_CACHE_KEY = "correction_email_digest_last_run"
+# Corrections are stamped when saved but only visible once their transaction
+# commits, so the digest window ends this far in the past to not skip them
+CORRECTION_DIGEST_SETTLE_TIME = timedelta(minutes=5)
+
+
+@celery_app.task()
+def refresh_top_correctors_task(period=None):
+    """
+    Refreshes the given leaderboard, or all of them. Scheduled through
+    CELERY_BEAT_SCHEDULE more often than the cache timeout to keep them warm.
+    """
+    for refreshed_period in [period] if period else start_dates:
+        refresh_top_correctors(refreshed_period)
+
+
+@celery_app.task()
+def export_corrections_pdf_task(post_id):
+    """
+    Renders the post's corrections to a PDF in storage. Returns the file key,
+    or None if the post is gone or rendering failed.
+    """
+    post = Post.available_objects.select_related("user").filter(id=post_id).first()
+
+    if post is None:
+        return None
+
+    try:
+        return ExportCorrections(post).save_pdf()
+    except Exception:
+        logger.exception("Failed to export corrections as a PDF.")
+        return None
+
+
+@celery_app.task()
+def export_user_corrections_task(  # noqa: PLR0913
+    job_id,
+    user_id,
+    export_format,
+    lang_code=None,
+    start_date=None,
+    end_date=None,
+):
+    """
+    Exports the corrections on all of the user's posts into storage. Returns
+    the file key, or None if the user is gone or the export failed.
+    """
+    user = User.objects.filter(id=user_id).first()
+
+    if user is None:
+        return None
+
+    exporter = BulkExportCorrections(
+        user,
+        export_format,
+        lang_code=lang_code,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+    try:
+        return exporter.run(job_id)
+    except Exception:
+        logger.exception("Failed to export the user's corrections.")
+        return None
+
+
+@celery_app.task()
+def email_new_correction_task(post_id):
+    """Emails the post's author about a new correction, see make_corrections."""
+    post = Post.available_objects.select_related("user").filter(id=post_id).first()
+
+    if post is None:
+        return False
+
+    email_new_correction(post)
+    return True
+
+
+@celery_app.task()
+def send_correction_digests_task(batch_size=EMAIL_BATCH_SIZE):
+    """
+    Emails each premium user one digest of the corrections their posts got
+    since the last run, see CORRECTION_EMAIL_DIGEST. Emails are sent
+    batch_size at a time, each batch over a single connection. Users whose
+    email failed get their corrections again in the next run, see
+    correction_digest_retry_since. Returns the number of emails sent.
+    """
+    until = timezone.now() - CORRECTION_DIGEST_SETTLE_TIME
+    since = cache.get(CORRECTION_DIGEST_LAST_RUN_CACHE_KEY) or until - timedelta(
+        minutes=settings.CORRECTION_EMAIL_DIGEST_MINUTES,
+    )
+
+    if since >= until:
+        return 0
+
+    sender = EmailSender()
+    messages = {
+        user.id: build_correction_digest_email(user, corrected_posts, sender=sender)
+        for user, corrected_posts in get_corrected_posts_by_author(since, until).items()
+        if user.email and user.is_premium_user
+    }
+    user_ids = list(messages)
+    failed_user_ids = []
+
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start : start + batch_size]
+        sent = set(sender.send_emails([messages[user_id] for user_id in batch]))
+        failed_user_ids.extend(
+            user_id for user_id in batch if messages[user_id] not in sent
+        )
+
+    with transaction.atomic():
+        # A user failing again keeps the start of their first failed digest
+        User.all_objects.filter(
+            id__in=failed_user_ids,
+            correction_digest_retry_since__isnull=True,
+        ).update(correction_digest_retry_since=since)
+        User.all_objects.filter(correction_digest_retry_since__isnull=False).exclude(
+            id__in=failed_user_ids,
+        ).update(correction_digest_retry_since=None)
+
+    cache.set(CORRECTION_DIGEST_LAST_RUN_CACHE_KEY, until, timeout=None)
+
+    if failed_user_ids:
+        logger.warning(
+            "Failed to send %s of %s correction digests.",
+            len(failed_user_ids),
+            len(messages),
+        )
+
+    return len(messages) - len(failed_user_ids)
@@ -0,0 +1,208 @@
+# ruff: noqa: PT009
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from langcorrect.contributions.helpers import rebuild_daily_contributions
+from langcorrect.contributions.models import DailyContribution
+from langcorrect.corrections.helpers import bulk_create_or_update_corrections
+from langcorrect.corrections.helpers import bulk_delete_corrections
+from langcorrect.corrections.helpers import get_post_rows
+from langcorrect.corrections.helpers import get_top_correctors
+from langcorrect.corrections.models import PostCorrection
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.languages.models import Language
+from langcorrect.posts.models import Post
+from langcorrect.users.tests.factories import UserFactory
+from langcorrect.utils.caching import CacheEntry
+
+
+class TestBulkCorrections(TestCase):
+    def setUp(self):
+        self.author = UserFactory()
+        self.corrector = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.post = Post.objects.create(
+            user=self.author,
+            language=self.en_lang,
+            title="My day",
+            text="I has a cat. It are black.",
+        )
+        self.title_row, self.first_row, self.second_row = get_post_rows(
+            self.post,
+        ).order_by("order")
+        self.user_correction = PostUserCorrection.available_objects.create(
+            post=self.post,
+            user=self.corrector,
+        )
+
+    def test_creates_corrections(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [
+                (self.title_row, PostCorrection.FeedbackType.PERFECT, "", ""),
+                (
+                    self.first_row,
+                    PostCorrection.FeedbackType.CORRECTED,
+                    "I have a cat.",
+                    "Use 'have' with 'I'.",
+                ),
+            ],
+        )
+
+        corrections = PostCorrection.available_objects.filter(
+            user_correction=self.user_correction,
+        )
+        self.assertEqual(corrections.count(), 2)
+
+        corrected = corrections.get(post_row=self.first_row)
+        self.assertEqual(corrected.correction, "I have a cat.")
+        self.assertEqual(corrected.display_correction, corrected.correction_html)
+        self.assertNotEqual(corrected.correction_html, "")
+
+    def test_updates_existing_corrections(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.first_row, PostCorrection.FeedbackType.CORRECTED, "I had.", "")],
+        )
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.first_row, PostCorrection.FeedbackType.PERFECT, "", "")],
+        )
+
+        correction = PostCorrection.available_objects.get(
+            user_correction=self.user_correction,
+            post_row=self.first_row,
+        )
+        self.assertEqual(correction.feedback_type, PostCorrection.FeedbackType.PERFECT)
+        self.assertEqual(correction.correction, "")
+        self.assertEqual(correction.correction_html, "")
+
+    def test_revives_soft_deleted_corrections(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.second_row, PostCorrection.FeedbackType.PERFECT, "", "")],
+        )
+        bulk_delete_corrections(self.user_correction, [self.second_row.id])
+        self.assertFalse(
+            PostCorrection.available_objects.filter(
+                user_correction=self.user_correction,
+            ).exists(),
+        )
+
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.second_row, PostCorrection.FeedbackType.CORRECTED, "It is.", "")],
+        )
+
+        self.assertEqual(
+            PostCorrection.all_objects.filter(
+                user_correction=self.user_correction,
+            ).count(),
+            1,
+        )
+        correction = PostCorrection.available_objects.get(
+            user_correction=self.user_correction,
+        )
+        self.assertEqual(correction.correction, "It is.")
+
+
+class TestTopCorrectors(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = UserFactory()
+        self.corrector = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.post = Post.objects.create(
+            user=self.author,
+            language=self.en_lang,
+            title="My day",
+            text="I has a cat. It are black.",
+        )
+        self.rows = list(get_post_rows(self.post).order_by("order"))
+        self.user_correction = PostUserCorrection.available_objects.create(
+            post=self.post,
+            user=self.corrector,
+        )
+
+    def get_count(self):
+        return DailyContribution.objects.get(
+            user=self.corrector,
+            date=timezone.localdate(),
+        ).correction_count
+
+    def test_buckets_follow_creates_and_deletes(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(row, PostCorrection.FeedbackType.PERFECT, "", "") for row in self.rows],
+        )
+        self.assertEqual(self.get_count(), 3)
+
+        # Updating existing corrections doesn't count them twice
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.rows[1], PostCorrection.FeedbackType.CORRECTED, "I have.", "")],
+        )
+        self.assertEqual(self.get_count(), 3)
+
+        bulk_delete_corrections(self.user_correction, [self.rows[1].id])
+        self.assertEqual(self.get_count(), 2)
+
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(self.rows[1], PostCorrection.FeedbackType.PERFECT, "", "")],
+        )
+        self.assertEqual(self.get_count(), 3)
+
+    def test_top_correctors(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(row, PostCorrection.FeedbackType.PERFECT, "", "") for row in self.rows],
+        )
+
+        for period in ["daily", "weekly", "monthly", "all_time"]:
+            self.assertEqual(
+                get_top_correctors(period),
+                [
+                    {
+                        "user_correction__user__username": self.corrector.username,
+                        "user_correction__user__nick_name": self.corrector.nick_name,
+                        "correction_count": 3,
+                    },
+                ],
+            )
+
+    @patch(
+        "langcorrect.corrections.tasks.refresh_top_correctors_task.delay",
+        side_effect=OSError("broker unavailable"),
+    )
+    def test_stale_leaderboard_survives_broker_outage(self, mock_delay):
+        cache.set("top_correctors_daily", CacheEntry(["stale"], time.time() - 1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertEqual(get_top_correctors("daily"), ["stale"])
+
+        self.assertEqual(len(callbacks), 1)
+        mock_delay.assert_called_once_with("daily")
+
+    def test_reconcile_fixes_drift(self):
+        bulk_create_or_update_corrections(
+            self.user_correction,
+            [(row, PostCorrection.FeedbackType.PERFECT, "", "") for row in self.rows],
+        )
+        DailyContribution.objects.update(correction_count=10)
+        stale = DailyContribution.objects.create(
+            user=self.corrector,
+            date=timezone.localdate() - timedelta(days=3),
+            correction_count=2,
+        )
+
+        self.assertEqual(rebuild_daily_contributions(user_ids=[self.corrector.id]), 2)
+
+        self.assertEqual(self.get_count(), 3)
+        stale.refresh_from_db()
+        self.assertEqual(stale.correction_count, 0)
@@ -0,0 +1,128 @@
+# ruff: noqa: PT009
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.test import TestCase
+from django.utils import timezone
+
+from langcorrect.corrections.helpers import bulk_create_or_update_corrections
+from langcorrect.corrections.helpers import get_post_rows
+from langcorrect.corrections.models import PostCorrection
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.corrections.tasks import CORRECTION_DIGEST_SETTLE_TIME
+from langcorrect.corrections.tasks import email_new_correction_task
+from langcorrect.corrections.tasks import send_correction_digests_task
+from langcorrect.languages.models import Language
+from langcorrect.posts.models import Post
+from langcorrect.subscriptions.models import StripeCustomer
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestCorrectionEmails(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.author = self.create_premium_user()
+
+    def create_premium_user(self):
+        user = UserFactory()
+        StripeCustomer.objects.create(
+            user=user,
+            customer_id=f"cus_{user.id}",
+            premium_until=timezone.now() + timedelta(days=30),
+        )
+        return user
+
+    def create_corrected_post(self, title, correctors, author=None):
+        post = Post.objects.create(
+            user=author or self.author,
+            language=self.en_lang,
+            title=title,
+            text="I has a cat.",
+        )
+        _, post_row = get_post_rows(post).order_by("order")
+
+        for corrector in correctors:
+            user_correction = PostUserCorrection.available_objects.create(
+                post=post,
+                user=corrector,
+            )
+            bulk_create_or_update_corrections(
+                user_correction,
+                [(post_row, PostCorrection.FeedbackType.CORRECTED, "I have.", "")],
+            )
+        return post
+
+    def settle_corrections(self):
+        PostCorrection.available_objects.update(
+            modified=timezone.now() - CORRECTION_DIGEST_SETTLE_TIME * 2,
+        )
+
+    def test_email_new_correction(self):
+        post = self.create_corrected_post("My day", [UserFactory()])
+
+        self.assertTrue(email_new_correction_task(post.id))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.author.email])
+
+    def test_digest_groups_corrections_per_author(self):
+        correctors = UserFactory.create_batch(3)
+        self.create_corrected_post("My day", correctors[:2])
+        self.create_corrected_post("My cat", correctors[2:])
+
+        # Authors without premium don't get emails
+        self.create_corrected_post("Your day", correctors[:1], author=UserFactory())
+        self.settle_corrections()
+
+        self.assertEqual(send_correction_digests_task(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.author.email])
+        for corrector in correctors:
+            self.assertIn(corrector.display_name, mail.outbox[0].body)
+
+        # Corrections are only included in one digest
+        self.assertEqual(send_correction_digests_task(), 0)
+
+    def test_digest_skips_recent_corrections(self):
+        """
+        Test that corrections saved within the settle time are left for the
+        next run, in case their transaction has not committed yet.
+        """
+        self.create_corrected_post("My day", [UserFactory()])
+
+        self.assertEqual(send_correction_digests_task(), 0)
+
+        later = timezone.now() + CORRECTION_DIGEST_SETTLE_TIME * 2
+        with patch("langcorrect.corrections.tasks.timezone.now", return_value=later):
+            self.assertEqual(send_correction_digests_task(), 1)
+
+    @patch("langcorrect.utils.mailing.EmailSender._capture_exception")
+    def test_digest_is_retried_after_failure(self, mock_capture_exception):
+        other_author = self.create_premium_user()
+        self.create_corrected_post("My day", [UserFactory()])
+        self.create_corrected_post("Your day", [UserFactory()], author=other_author)
+        self.settle_corrections()
+
+        send_messages = locmem.EmailBackend.send_messages
+
+        def fail_for_author(backend, messages):
+            if messages[0].to == [self.author.email]:
+                raise SMTPException
+            return send_messages(backend, messages)
+
+        with patch.object(locmem.EmailBackend, "send_messages", fail_for_author):
+            self.assertEqual(send_correction_digests_task(), 1)
+
+        mock_capture_exception.assert_called_once()
+        self.assertEqual([email.to for email in mail.outbox], [[other_author.email]])
+
+        # Only the failed digest is sent again
+        self.assertEqual(send_correction_digests_task(), 1)
+        self.assertEqual(mail.outbox[-1].to, [self.author.email])
+        self.assertIn("My day", mail.outbox[-1].body)
+
+        self.assertEqual(send_correction_digests_task(), 0)
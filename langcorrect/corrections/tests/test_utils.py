@@ -0,0 +1,161 @@
+# ruff: noqa: PT009
+import io
+import json
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from langcorrect.corrections.constants import ExportStatus
+from langcorrect.corrections.constants import FileFormat
+from langcorrect.corrections.helpers import bulk_create_or_update_corrections
+from langcorrect.corrections.helpers import bulk_delete_corrections
+from langcorrect.corrections.helpers import get_post_rows
+from langcorrect.corrections.models import PostCorrection
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.corrections.utils import PDF_EXPORT_MAX_RETRIES
+from langcorrect.corrections.utils import BulkExportCorrections
+from langcorrect.corrections.utils import ExportCorrections
+from langcorrect.languages.models import Language
+from langcorrect.posts.models import Post
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestExportCorrections(TestCase):
+    def setUp(self):
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.post = Post.objects.create(
+            user=UserFactory(),
+            language=self.en_lang,
+            title="My day",
+            text="I has a cat. It are black.",
+        )
+        _, self.first_row, self.second_row = get_post_rows(self.post).order_by("order")
+
+        for corrector in [UserFactory(), UserFactory()]:
+            self.user_correction = PostUserCorrection.available_objects.create(
+                post=self.post,
+                user=corrector,
+            )
+            bulk_create_or_update_corrections(
+                self.user_correction,
+                [
+                    (self.first_row, PostCorrection.FeedbackType.CORRECTED, "I.", ""),
+                    (self.second_row, PostCorrection.FeedbackType.PERFECT, "", ""),
+                ],
+            )
+
+    def get_content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_csv(self):
+        with self.assertNumQueries(2):
+            content = self.get_content(ExportCorrections(self.post).export_csv())
+
+        lines = content.splitlines()
+        self.assertEqual(lines[0], "Original,Correction,Feedback,Type,Corrector")
+        self.assertEqual(len(lines), 5)
+
+    def test_export_json(self):
+        with self.assertNumQueries(2):
+            content = self.get_content(ExportCorrections(self.post).export_json())
+
+        rows = json.loads(content)
+        self.assertCountEqual(
+            [row["original_sentence"] for row in rows],
+            ["I has a cat.", "It are black."],
+        )
+        self.assertEqual([len(row["corrections"]) for row in rows], [2, 2])
+
+    def test_pdf_digest_follows_corrections(self):
+        digest = ExportCorrections(self.post).pdf_digest
+        self.assertEqual(ExportCorrections(self.post).pdf_digest, digest)
+
+        bulk_delete_corrections(self.user_correction, [self.second_row.id])
+        self.assertNotEqual(ExportCorrections(self.post).pdf_digest, digest)
+
+    def test_pdf_digest_follows_overall_feedback(self):
+        digest = ExportCorrections(self.post).pdf_digest
+
+        self.user_correction.overall_feedback = "Great job!"
+        self.user_correction.save()
+        self.assertNotEqual(ExportCorrections(self.post).pdf_digest, digest)
+
+    @patch("langcorrect.corrections.tasks.export_corrections_pdf_task.delay")
+    def test_schedules_pdf_export_once(self, mock_export):
+        cache.clear()
+        exporter = ExportCorrections(self.post)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            exporter.schedule_pdf_export()
+            exporter.schedule_pdf_export()
+
+        mock_export.assert_called_once_with(self.post.id)
+        self.assertEqual(exporter.get_pdf_status(), ExportStatus.PENDING)
+
+    def test_bulk_export_csv(self):
+        file = io.StringIO()
+
+        with self.assertNumQueries(1):
+            BulkExportCorrections(self.post.user, FileFormat.CSV).write_csv(file)
+
+        lines = file.getvalue().splitlines()
+        self.assertEqual(
+            lines[0],
+            "Date,Language,Title,Original,Correction,Feedback,Corrector",
+        )
+        # Only corrected sentences are exported, once per corrector
+        self.assertEqual(len(lines), 3)
+
+    def test_bulk_export_json_filters(self):
+        file = io.StringIO()
+        BulkExportCorrections(
+            self.post.user,
+            FileFormat.JSON,
+            lang_code="en",
+            start_date=self.post.created.date().isoformat(),
+        ).write_json(file)
+
+        rows = json.loads(file.getvalue())
+        self.assertEqual([row["corrected_sentence"] for row in rows], ["I.", "I."])
+
+        file = io.StringIO()
+        BulkExportCorrections(
+            self.post.user,
+            FileFormat.JSON,
+            lang_code="ja",
+        ).write_json(file)
+        self.assertEqual(json.loads(file.getvalue()), [])
+
+    @patch("langcorrect.corrections.tasks.export_user_corrections_task.delay")
+    def test_schedules_bulk_export(self, mock_export):
+        cache.clear()
+        exporter = BulkExportCorrections(self.post.user, FileFormat.ANKI)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            job_id = exporter.schedule(lang_code="en")
+
+        mock_export.assert_called_once_with(
+            job_id,
+            self.post.user.id,
+            FileFormat.ANKI,
+            lang_code="en",
+        )
+        self.assertEqual(
+            BulkExportCorrections.get_job(job_id),
+            {"user_id": self.post.user.id, "status": ExportStatus.PENDING},
+        )
+
+    @patch("langcorrect.corrections.tasks.export_corrections_pdf_task.delay")
+    def test_retries_pdf_export_a_bounded_number_of_times(self, mock_export):
+        cache.clear()
+        exporter = ExportCorrections(self.post)
+
+        for _ in range(PDF_EXPORT_MAX_RETRIES):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertTrue(exporter.retry_pdf_export())
+            # The job was lost before it could report a status
+            cache.delete(exporter.pdf_status_cache_key)
+
+        self.assertFalse(exporter.retry_pdf_export())
+        self.assertEqual(mock_export.call_count, PDF_EXPORT_MAX_RETRIES)
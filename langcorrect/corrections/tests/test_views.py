@@ -0,0 +1,86 @@
+# ruff: noqa: PT009
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from langcorrect.corrections.helpers import bulk_create_or_update_corrections
+from langcorrect.corrections.helpers import get_post_rows
+from langcorrect.corrections.models import PostCorrection
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.languages.models import Language
+from langcorrect.languages.models import LanguageLevel
+from langcorrect.languages.models import LevelChoices
+from langcorrect.posts.models import Post
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestMakeCorrectionsPrefill(TestCase):
+    def setUp(self):
+        self.author = UserFactory()
+        self.corrector = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        LanguageLevel.objects.create(
+            user=self.corrector,
+            language=self.en_lang,
+            level=LevelChoices.NATIVE,
+        )
+        self.client.force_login(self.corrector)
+
+    def create_corrected_post(self, sentence_count):
+        post = Post.objects.create(
+            user=self.author,
+            language=self.en_lang,
+            title="My day",
+            text=" ".join(
+                f"This is sentence number {i}." for i in range(sentence_count)
+            ),
+        )
+        user_correction = PostUserCorrection.available_objects.create(
+            post=post,
+            user=self.corrector,
+        )
+        bulk_create_or_update_corrections(
+            user_correction,
+            [
+                (post_row, PostCorrection.FeedbackType.CORRECTED, "Corrected.", "")
+                for post_row in get_post_rows(post)
+            ],
+        )
+        return post
+
+    def get_query_count(self, post):
+        url = reverse("posts:make-corrections", kwargs={"slug": post.slug})
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["is_edit"])
+        return len(context)
+
+    def test_prefill_query_count_is_constant(self):
+        """
+        Test that reopening an entry for editing costs the same number of
+        queries regardless of how many sentences it has.
+        """
+        short_post = self.create_corrected_post(sentence_count=2)
+        long_post = self.create_corrected_post(sentence_count=40)
+
+        # Warm up per-process caches (content types, sites, etc.)
+        self.get_query_count(short_post)
+
+        self.assertEqual(
+            self.get_query_count(short_post),
+            self.get_query_count(long_post),
+        )
+
+    def test_prefill_uses_previous_corrections(self):
+        post = self.create_corrected_post(sentence_count=3)
+        url = reverse("posts:make-corrections", kwargs={"slug": post.slug})
+
+        response = self.client.get(url)
+
+        for post_row in response.context["post_rows"]:
+            self.assertTrue(post_row.is_action_taken)
+            self.assertEqual(post_row.correction, "Corrected.")
@@ -1,20 +1,35 @@
-# ruff: noqa: TRY300,BLE001
 import csv
+import hashlib
 import json
-import logging
 import tempfile
-from io import StringIO
+import textwrap
+import uuid
+from functools import cached_property
+from functools import partial
 from pathlib import Path
 
-from django.http import HttpResponse
+import genanki
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Prefetch
+from django.http import FileResponse
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
+from django.utils.html import escape
 from weasyprint import HTML
 
 from config.settings.base import SITE_BASE_URL
+from langcorrect.corrections.constants import ExportStatus
+from langcorrect.corrections.constants import FileFormat
+from langcorrect.corrections.models import PostCorrection
+from langcorrect.corrections.models import PostUserCorrection
 from langcorrect.posts.models import PostRow
 
-logger = logging.getLogger(__name__)
-
 CSV_HEADERS = [
     "Original",
     "Correction",
@@ -23,100 +38,450 @@ CSV_HEADERS = [
     "Corrector",
 ]
 EXCLUDE_TITLE_ROW = 0
+EXPORT_CHUNK_SIZE = 500
+PDF_EXPORT_DIRECTORY = "exports/corrections"
+PDF_EXPORT_STATUS_TIMEOUT = 60 * 10
+PDF_EXPORT_MAX_RETRIES = 3
+BULK_CSV_HEADERS = [
+    "Date",
+    "Language",
+    "Title",
+    "Original",
+    "Correction",
+    "Feedback",
+    "Corrector",
+]
+BULK_EXPORT_DIRECTORY = "exports/users"
+BULK_EXPORT_JOB_TIMEOUT = 60 * 60 * 24
+BULK_EXPORT_EXTENSIONS = {
+    FileFormat.ANKI: "apkg",
+    FileFormat.CSV: "csv",
+    FileFormat.JSON: "json",
+}
+# Anki identifies note types and decks by these ids, keep them stable so that
+# re-importing an export updates the existing deck instead of duplicating it
+ANKI_MODEL_ID = 1607392319
+ANKI_DECK_ID_OFFSET = 2059400110
+ANKI_MODEL = genanki.Model(
+    ANKI_MODEL_ID,
+    "LangCorrect Correction",
+    fields=[{"name": "Original"}, {"name": "Correction"}, {"name": "Feedback"}],
+    templates=[
+        {
+            "name": "Correction",
+            "qfmt": "{{Original}}",
+            "afmt": '{{FrontSide}}<hr id="answer">{{Correction}}'
+            "<br><small>{{Feedback}}</small>",
+        },
+    ],
+)
+
+
+class Echo:
+    """A file-like object that returns what is written, for streaming csv."""
+
+    def write(self, value):
+        return value
+
+
+def get_export_post_rows(post_rows):
+    """
+    Prefetches the corrections, and their correctors, of the given post rows
+    so exports run a constant number of queries.
+    """
+    return post_rows.exclude(order=EXCLUDE_TITLE_ROW).prefetch_related(
+        Prefetch(
+            "postcorrection_set",
+            queryset=PostCorrection.available_objects.select_related(
+                "user_correction__user",
+            ),
+        ),
+    )
+
+
+def iter_csv_lines(post_rows):
+    writer = csv.writer(Echo())
+
+    yield writer.writerow(CSV_HEADERS)
+
+    for post_row in post_rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        for post_correction in post_row.postcorrection_set.all():
+            yield writer.writerow(
+                [
+                    post_row.sentence,
+                    post_correction.correction,
+                    post_correction.note,
+                    post_correction.feedback_type,
+                    post_correction.user_correction.user.display_name,
+                ],
+            )
+
+
+def iter_json_array(items):
+    """Yields the same document as json.dumps(list(items), indent=4), item by item."""
+    separator = "[\n"
+
+    for item in items:
+        yield separator + textwrap.indent(json.dumps(item, indent=4), " " * 4)
+        separator = ",\n"
+
+    yield "[]" if separator == "[\n" else "\n]"
+
+
+def iter_json_chunks(post_rows):
+    return iter_json_array(
+        {
+            "original_sentence": post_row.sentence,
+            "corrections": [
+                {
+                    "corrected_sentence": post_correction.correction,
+                    "correction_feedback": post_correction.note,
+                    "corrector": post_correction.user_correction.user.display_name,
+                }
+                for post_correction in post_row.postcorrection_set.all()
+            ],
+        }
+        for post_row in post_rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
 
 
 class ExportCorrections:
     def __init__(self, post) -> None:
         self.post = post
-        self.post_rows = (
-            PostRow.available_objects.filter(post=post)
-            .exclude(order=EXCLUDE_TITLE_ROW)
-            .order_by("created")
+        self.post_rows = get_export_post_rows(
+            PostRow.available_objects.filter(post=post).order_by("created"),
         )
 
-    def export_csv(self) -> HttpResponse:
-        """Export the post sentences and their corrections to a CSV file."""
-        output = StringIO()
-        writer = csv.writer(output)
-
-        writer.writerow(CSV_HEADERS)
-
-        for post_row in self.post_rows:
-            for post_correction in post_row.postcorrection_set.all():
-                writer.writerow(
-                    [
-                        post_row.sentence,
-                        post_correction.correction,
-                        post_correction.note,
-                        post_correction.feedback_type,
-                        post_correction.user_correction.user.display_name,
-                    ],
-                )
-
-        output.seek(0)
-
+    def export_csv(self) -> StreamingHttpResponse:
+        """Stream the post sentences and their corrections as a CSV file."""
         yyyy_mm_dd = self.post.created.strftime("%Y-%m-%d")
 
-        response = HttpResponse(output.read(), content_type="text/csv")
+        response = StreamingHttpResponse(
+            iter_csv_lines(self.post_rows),
+            content_type="text/csv",
+        )
         response["Content-Disposition"] = f"attachment; filename={yyyy_mm_dd}.csv"
         return response
 
-    def export_pdf(self) -> HttpResponse:
-        try:
-            html_string = render_to_string(
-                "corrections/export_corrections_pdf.html",
-                {"post": self.post, "post_rows": self.post_rows},
+    @cached_property
+    def pdf_digest(self) -> str:
+        """
+        Changes whenever the post, any of its corrections or any overall
+        feedback change.
+        """
+        corrections = PostCorrection.available_objects.filter(
+            post_row__post=self.post,
+        ).aggregate(count=Count("id"), last_modified=Max("modified"))
+        user_corrections = PostUserCorrection.available_objects.filter(
+            post=self.post,
+        ).aggregate(count=Count("id"), last_modified=Max("modified"))
+
+        payload = "\x00".join(
+            [
+                str(self.post.id),
+                self.post.modified.isoformat(),
+                str(corrections["count"]),
+                str(corrections["last_modified"]),
+                str(user_corrections["count"]),
+                str(user_corrections["last_modified"]),
+            ],
+        ).encode()
+        return hashlib.sha1(payload, usedforsecurity=False).hexdigest()
+
+    @property
+    def pdf_directory(self) -> str:
+        return f"{PDF_EXPORT_DIRECTORY}/{self.post.id}"
+
+    @property
+    def pdf_file_key(self) -> str:
+        return f"{self.pdf_directory}/{self.pdf_digest}.pdf"
+
+    @property
+    def pdf_status_cache_key(self) -> str:
+        return f"corrections_pdf_export_{self.post.id}_{self.pdf_digest}"
+
+    def get_pdf_status(self) -> str | None:
+        """Returns the ExportStatus of the current version, or None."""
+        if default_storage.exists(self.pdf_file_key):
+            return ExportStatus.READY
+        return cache.get(self.pdf_status_cache_key)
+
+    def schedule_pdf_export(self) -> None:
+        """Queues a PDF export unless one is already running for this version."""
+        from langcorrect.corrections.tasks import export_corrections_pdf_task
+
+        if cache.add(
+            self.pdf_status_cache_key,
+            ExportStatus.PENDING,
+            timeout=PDF_EXPORT_STATUS_TIMEOUT,
+        ):
+            transaction.on_commit(
+                partial(export_corrections_pdf_task.delay, self.post.id),
             )
 
-            html = HTML(string=html_string, encoding="utf-8", base_url=SITE_BASE_URL)
-            result = html.write_pdf()
+    def retry_pdf_export(self) -> bool:
+        """
+        Queues the PDF export again when its job was lost, e.g. the status
+        expired or the post changed since it was queued. Returns False once
+        this version has been retried PDF_EXPORT_MAX_RETRIES times.
+        """
+        retries_cache_key = f"{self.pdf_status_cache_key}_retries"
+        cache.add(retries_cache_key, 0, timeout=PDF_EXPORT_STATUS_TIMEOUT)
+
+        if cache.incr(retries_cache_key) > PDF_EXPORT_MAX_RETRIES:
+            return False
 
-            yyyy_mm_dd = self.post.created.strftime("%Y-%m-%d")
+        self.schedule_pdf_export()
+        return True
 
-            response = HttpResponse(content_type="application/pdf")
-            response["Content-Disposition"] = f"attachment; filename={yyyy_mm_dd}.pdf"
+    def render_pdf(self) -> bytes:
+        html_string = render_to_string(
+            "corrections/export_corrections_pdf.html",
+            {"post": self.post, "post_rows": self.post_rows},
+        )
+        html = HTML(string=html_string, encoding="utf-8", base_url=SITE_BASE_URL)
+        return html.write_pdf()
 
-            with tempfile.NamedTemporaryFile(delete=True) as output:
-                output.write(result)
-                output.flush()
+    def save_pdf(self) -> str:
+        """
+        Renders the PDF into storage, unless this version is already there, and
+        deletes older versions. Returns the file key.
+        """
+        file_key = self.pdf_file_key
 
-                temp_path = Path(output.name)
-                with temp_path.open("rb") as f:
-                    response.write(f.read())
-            return response
+        try:
+            if not default_storage.exists(file_key):
+                default_storage.save(file_key, ContentFile(self.render_pdf()))
         except Exception:
-            logger.exception("Failed to export corrections as a PDF.")
-            return HttpResponse(
-                "An error occurred while generating the PDF.",
-                status=500,
+            cache.set(
+                self.pdf_status_cache_key,
+                ExportStatus.FAILED,
+                timeout=PDF_EXPORT_STATUS_TIMEOUT,
             )
+            raise
 
-    def export_json(self) -> HttpResponse:
-        try:
-            post_rows = [
-                {
-                    "original_sentence": post_row.sentence,
-                    "corrections": [
-                        {
-                            "corrected_sentence": post_correction.correction,
-                            "correction_feedback": post_correction.note,
-                            "corrector": post_correction.user_correction.user.display_name,  # noqa: E501
-                        }
-                        for post_correction in post_row.postcorrection_set.all()
+        cache.delete(self.pdf_status_cache_key)
+
+        _, file_names = default_storage.listdir(self.pdf_directory)
+        for file_name in file_names:
+            if f"{self.pdf_directory}/{file_name}" != file_key:
+                default_storage.delete(f"{self.pdf_directory}/{file_name}")
+
+        return file_key
+
+    def export_pdf(self) -> FileResponse:
+        """Serve the stored PDF, see save_pdf."""
+        yyyy_mm_dd = self.post.created.strftime("%Y-%m-%d")
+
+        return FileResponse(
+            default_storage.open(self.pdf_file_key, "rb"),
+            as_attachment=True,
+            filename=f"{yyyy_mm_dd}.pdf",
+            content_type="application/pdf",
+        )
+
+    def export_json(self) -> StreamingHttpResponse:
+        """Stream the post sentences and their corrections as a JSON file."""
+        yyyy_mm_dd = self.post.created.strftime("%Y-%m-%d")
+
+        response = StreamingHttpResponse(
+            iter_json_chunks(self.post_rows),
+            content_type="application/json",
+        )
+        response["Content-Disposition"] = f"attachment; filename={yyyy_mm_dd}.json"
+        return response
+
+
+class BulkExportCorrections:
+    """
+    Exports the corrections a user received on all of their posts, optionally
+    filtered by language and by the date the posts were written.
+
+    Exports run in a Celery worker, see schedule, which reads the corrections
+    in chunks and writes them to a temporary file before moving it to storage,
+    so memory use doesn't grow with the number of corrections.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        user,
+        export_format,
+        lang_code=None,
+        start_date=None,
+        end_date=None,
+    ) -> None:
+        self.user = user
+        self.export_format = export_format
+
+        corrections = PostCorrection.available_objects.filter(
+            post_row__post__user=user,
+            post_row__post__is_removed=False,
+            post_row__is_removed=False,
+            post_row__is_actual=True,
+            feedback_type=PostCorrection.FeedbackType.CORRECTED,
+        ).exclude(post_row__order=EXCLUDE_TITLE_ROW)
+
+        if lang_code:
+            corrections = corrections.filter(post_row__post__language__code=lang_code)
+        if start_date:
+            corrections = corrections.filter(
+                post_row__post__created__date__gte=start_date,
+            )
+        if end_date:
+            corrections = corrections.filter(
+                post_row__post__created__date__lte=end_date,
+            )
+
+        self.corrections = corrections.select_related(
+            "post_row__post__language",
+            "user_correction__user",
+        ).order_by("post_row__post__created", "post_row__order", "id")
+
+    @staticmethod
+    def get_job_cache_key(job_id) -> str:
+        return f"corrections_bulk_export_{job_id}"
+
+    @classmethod
+    def get_job(cls, job_id) -> dict | None:
+        return cache.get(cls.get_job_cache_key(job_id))
+
+    @classmethod
+    def set_job(cls, job_id, **job) -> None:
+        cache.set(cls.get_job_cache_key(job_id), job, timeout=BULK_EXPORT_JOB_TIMEOUT)
+
+    def schedule(self, **filters) -> str:
+        """
+        Queues the export in a worker and returns its job id, which the status
+        view polls until the file is ready. Filters are passed to the task as
+        strings so they can be serialized.
+        """
+        from langcorrect.corrections.tasks import export_user_corrections_task
+
+        job_id = str(uuid.uuid4())
+        self.set_job(job_id, user_id=self.user.id, status=ExportStatus.PENDING)
+        transaction.on_commit(
+            partial(
+                export_user_corrections_task.delay,
+                job_id,
+                self.user.id,
+                self.export_format,
+                **filters,
+            ),
+        )
+        return job_id
+
+    def iter_corrections(self):
+        return self.corrections.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def serialize(post_correction) -> dict:
+        post = post_correction.post_row.post
+        return {
+            "date": post.created.strftime("%Y-%m-%d"),
+            "language": post.language.code,
+            "title": post.title,
+            "original_sentence": post_correction.post_row.sentence,
+            "corrected_sentence": post_correction.correction,
+            "correction_feedback": post_correction.note,
+            "corrector": post_correction.user_correction.user.display_name,
+        }
+
+    def write_csv(self, file) -> None:
+        writer = csv.writer(file)
+        writer.writerow(BULK_CSV_HEADERS)
+
+        for post_correction in self.iter_corrections():
+            writer.writerow(self.serialize(post_correction).values())
+
+    def write_json(self, file) -> None:
+        file.writelines(
+            iter_json_array(
+                self.serialize(post_correction)
+                for post_correction in self.iter_corrections()
+            ),
+        )
+
+    def write_anki(self, path) -> None:
+        deck = genanki.Deck(
+            ANKI_DECK_ID_OFFSET + self.user.id,
+            f"LangCorrect::{self.user.username}",
+        )
+
+        for post_correction in self.iter_corrections():
+            deck.add_note(
+                genanki.Note(
+                    model=ANKI_MODEL,
+                    fields=[
+                        escape(post_correction.post_row.sentence),
+                        post_correction.display_correction,
+                        escape(post_correction.note),
                     ],
-                }
-                for post_row in self.post_rows
-            ]
+                    guid=genanki.guid_for(post_correction.id),
+                ),
+            )
+
+        genanki.Package(deck).write_to_file(path)
+
+    @property
+    def directory(self) -> str:
+        return f"{BULK_EXPORT_DIRECTORY}/{self.user.id}"
+
+    def save(self, job_id) -> str:
+        """
+        Writes the export into storage and returns the file key. Only the
+        user's latest export is kept.
+        """
+        extension = BULK_EXPORT_EXTENSIONS[self.export_format]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / f"export.{extension}"
 
-            yyyy_mm_dd = self.post.created.strftime("%Y-%m-%d")
+            if self.export_format == FileFormat.ANKI:
+                self.write_anki(path)
+            else:
+                with path.open("w", encoding="utf-8", newline="") as file:
+                    if self.export_format == FileFormat.CSV:
+                        self.write_csv(file)
+                    else:
+                        self.write_json(file)
 
-            response = HttpResponse(content_type="application/json")
-            response["Content-Disposition"] = f"attachment; filename={yyyy_mm_dd}.json"
-            response.write(json.dumps(post_rows, indent=4))
-            return response
+            with path.open("rb") as file:
+                file_key = default_storage.save(
+                    f"{self.directory}/{job_id}.{extension}",
+                    File(file),
+                )
+
+        _, file_names = default_storage.listdir(self.directory)
+        for file_name in file_names:
+            if f"{self.directory}/{file_name}" != file_key:
+                default_storage.delete(f"{self.directory}/{file_name}")
+
+        return file_key
+
+    def run(self, job_id) -> str:
+        """Builds the export for a scheduled job and records its outcome."""
+        try:
+            file_key = self.save(job_id)
         except Exception:
-            logger.exception("Failed to export corrections as a JSON.")
-            return HttpResponse(
-                "An error occurred while generating the JSON.",
-                status=500,
-            )
+            self.set_job(job_id, user_id=self.user.id, status=ExportStatus.FAILED)
+            raise
+
+        self.set_job(
+            job_id,
+            user_id=self.user.id,
+            status=ExportStatus.READY,
+            file_key=file_key,
+        )
+        return file_key
+
+    @classmethod
+    def export_file(cls, job) -> FileResponse:
+        """Serve the stored file of a ready job, see run."""
+        file_key = job["file_key"]
+        extension = file_key.rsplit(".", 1)[-1]
+
+        return FileResponse(
+            default_storage.open(file_key, "rb"),
+            as_attachment=True,
+            filename=f"langcorrect-corrections.{extension}",
+        )
@@ -1,37 +1,49 @@
 # ruff: noqa: C901,PLR0915,PLR0912
 import json
+from functools import partial
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.core.files.storage import default_storage
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.dateparse import parse_date
 from django.utils.translation import gettext_lazy as translate
 from django.views.generic import ListView
 
 from langcorrect.constants import NotificationTypes
+from langcorrect.corrections.constants import ExportStatus
 from langcorrect.corrections.constants import FileFormat
+from langcorrect.corrections.helpers import bulk_create_or_update_corrections
+from langcorrect.corrections.helpers import bulk_delete_corrections
 from langcorrect.corrections.helpers import check_can_make_corrections
-from langcorrect.corrections.helpers import create_or_update_correction
-from langcorrect.corrections.helpers import delete_correction
 from langcorrect.corrections.helpers import delete_overall_feedback
-from langcorrect.corrections.helpers import get_corrected_sentence
+from langcorrect.corrections.helpers import get_corrected_sentences
 from langcorrect.corrections.helpers import get_or_create_post_user_correction
 from langcorrect.corrections.helpers import get_overall_feedback
 from langcorrect.corrections.helpers import get_post_rows
 from langcorrect.corrections.models import PostCorrection
 from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.corrections.tasks import email_new_correction_task
+from langcorrect.corrections.utils import BULK_EXPORT_EXTENSIONS
+from langcorrect.corrections.utils import BulkExportCorrections
 from langcorrect.corrections.utils import ExportCorrections
 from langcorrect.decorators import premium_required
 from langcorrect.helpers import create_notification
+from langcorrect.languages.models import Language
 from langcorrect.posts.helpers import update_post_correction_status
 from langcorrect.posts.models import Post
 from langcorrect.posts.models import PostRow
 from langcorrect.users.models import User
-from langcorrect.utils.mailing import email_new_correction
+
+ROWS_PENDING_RETRY_SECONDS = 2
+EXPORT_PENDING_RETRY_SECONDS = 2
 
 
 def _process_corrections(
@@ -40,33 +52,41 @@ def _process_corrections(
     user: User,
 ) -> bool:
     is_corrections_made = False
+    upsert_actions = [
+        PostCorrection.FeedbackType.PERFECT,
+        PostCorrection.FeedbackType.CORRECTED,
+    ]
 
+    # The last action submitted for a sentence wins
+    latest_corrections = {}
     for correction in corrections:
-        post_row_id = correction["sentence_id"]
-        corrected_text = correction["corrected_text"]
-        feedback = correction["feedback"]
-        action = correction["action"]
+        latest_corrections[int(correction["sentence_id"])] = correction
+        is_corrections_made |= correction["action"] in upsert_actions
+
+    post_rows = PostRow.available_objects.in_bulk(list(latest_corrections))
+    missing_post_row_ids = latest_corrections.keys() - post_rows.keys()
+    if missing_post_row_ids:
+        msg = f"PostRow(s) {sorted(missing_post_row_ids)} do not exist."
+        raise PostRow.DoesNotExist(msg)
 
-        post_row = PostRow.available_objects.get(id=post_row_id)
+    upserts = []
+    deletes = []
+
+    for post_row_id, correction in latest_corrections.items():
+        post_row = post_rows[post_row_id]
+        action = correction["action"]
 
         if action == PostCorrection.FeedbackType.PERFECT:
-            create_or_update_correction(
-                post_user_correction,
-                post_row,
-                PostCorrection.FeedbackType.PERFECT,
-            )
-            is_corrections_made |= True
+            upserts.append((post_row, action, "", ""))
         elif action == PostCorrection.FeedbackType.CORRECTED:
-            create_or_update_correction(
-                post_user_correction,
-                post_row,
-                PostCorrection.FeedbackType.CORRECTED,
-                corrected_text,
-                feedback,
-            )
-            is_corrections_made |= True
+            corrected_text = correction["corrected_text"]
+            feedback = correction["feedback"]
+            upserts.append((post_row, action, corrected_text, feedback))
         elif action == "delete":
-            delete_correction(post_user_correction, post_row)
+            deletes.append(post_row_id)
+
+    bulk_create_or_update_corrections(post_user_correction, upserts)
+    bulk_delete_corrections(post_user_correction, deletes)
 
     return is_corrections_made
 
@@ -131,8 +151,11 @@ def make_corrections(request, slug):
                     NotificationTypes.NEW_CORRECTION,
                 )
 
-                if post.user.is_premium_user:
-                    email_new_correction(post)
+                # Digests are sent by send_correction_digests_task instead
+                if post.user.is_premium_user and not settings.CORRECTION_EMAIL_DIGEST:
+                    transaction.on_commit(
+                        partial(email_new_correction_task.delay, post.id),
+                    )
             elif new_feedback_given:
                 create_notification(
                     current_user,
@@ -141,13 +164,25 @@ def make_corrections(request, slug):
                     NotificationTypes.NEW_COMMENT,
                 )
 
-        update_post_correction_status(post, status=new_correction_made)
         _remove_post_user_correction_if_empty(post_user_correction)
+        update_post_correction_status(post, status=new_correction_made)
         return redirect(reverse("posts:detail", kwargs={"slug": post.slug}))
     else:  # noqa: RET505
+        if post.rows_pending:
+            # The sentences are still being split by a worker
+            response = render(
+                request,
+                "corrections/rows_pending.html",
+                {"post": post},
+                status=202,
+            )
+            response["Refresh"] = str(ROWS_PENDING_RETRY_SECONDS)
+            return response
+
         post_rows = get_post_rows(post).order_by("order")
         overall_feedback = get_overall_feedback(post, current_user)
 
+        prev_corrections = get_corrected_sentences(post, current_user)
         is_edit = False
 
         for post_row in post_rows:
@@ -158,7 +193,7 @@ def make_corrections(request, slug):
             post_row.action = "none"
             post_row.is_title = post_row.order == 0
 
-            prev_correction = get_corrected_sentence(post_row, current_user)
+            prev_correction = prev_corrections.get(post_row.id)
             if prev_correction:
                 is_edit |= True
                 post_row.is_action_taken = True
@@ -194,7 +229,15 @@ def export_corrections(request, slug):
         case FileFormat.CSV:
             return ExportCorrections(post).export_csv()
         case FileFormat.PDF:
-            return ExportCorrections(post).export_pdf()
+            exporter = ExportCorrections(post)
+
+            if exporter.get_pdf_status() == ExportStatus.READY:
+                return exporter.export_pdf()
+
+            exporter.schedule_pdf_export()
+            return redirect(
+                reverse("posts:export-corrections-status", kwargs={"slug": slug}),
+            )
         case FileFormat.JSON:
             return ExportCorrections(post).export_json()
         case _:
@@ -202,6 +245,104 @@ def export_corrections(request, slug):
             return redirect(reverse("posts:detail", kwargs={"slug": post.slug}))
 
 
+@login_required
+@premium_required
+def export_corrections_status(request, slug):
+    post = get_object_or_404(Post, slug=slug)
+    exporter = ExportCorrections(post)
+
+    match exporter.get_pdf_status():
+        case ExportStatus.READY:
+            export_url = reverse("posts:export-corrections", kwargs={"slug": slug})
+            return redirect(f"{export_url}?format={FileFormat.PDF}")
+        case ExportStatus.FAILED:
+            messages.error(request, translate("Unable to export the corrections."))
+            return redirect(reverse("posts:detail", kwargs={"slug": slug}))
+        case None:
+            # The job expired or the post changed since it was queued
+            if not exporter.retry_pdf_export():
+                messages.error(request, translate("Unable to export the corrections."))
+                return redirect(reverse("posts:detail", kwargs={"slug": slug}))
+
+    return _render_export_pending(
+        request,
+        post.title,
+        reverse("posts:export-corrections-status", kwargs={"slug": slug}),
+    )
+
+
+@login_required
+@premium_required
+def export_user_corrections(request):
+    export_format = request.GET.get("format", "").upper()
+    lang_code = request.GET.get("lang_code") or None
+    filters = {"lang_code": lang_code}
+
+    if export_format not in BULK_EXPORT_EXTENSIONS:
+        messages.warning(request, translate("Invalid export format specified."))
+        return redirect(reverse("user_posts"))
+
+    if lang_code and not Language.objects.filter(code=lang_code).exists():
+        messages.warning(request, translate("Invalid language specified."))
+        return redirect(reverse("user_posts"))
+
+    for key in ["start_date", "end_date"]:
+        try:
+            value = parse_date(request.GET.get(key, ""))
+        except ValueError:
+            value = None
+
+        if request.GET.get(key) and value is None:
+            messages.warning(request, translate("Invalid date specified."))
+            return redirect(reverse("user_posts"))
+        filters[key] = value.isoformat() if value else None
+
+    exporter = BulkExportCorrections(request.user, export_format, **filters)
+    job_id = exporter.schedule(**filters)
+
+    return redirect(
+        reverse("export_user_corrections_status", kwargs={"job_id": job_id}),
+    )
+
+
+@login_required
+@premium_required
+def export_user_corrections_status(request, job_id):
+    job = BulkExportCorrections.get_job(job_id)
+
+    if job is None or job["user_id"] != request.user.id:
+        messages.error(request, translate("This export has expired."))
+        return redirect(reverse("user_posts"))
+
+    match job["status"]:
+        case ExportStatus.READY:
+            if default_storage.exists(job["file_key"]):
+                return BulkExportCorrections.export_file(job)
+            # Replaced by a more recent export
+            messages.error(request, translate("This export has expired."))
+            return redirect(reverse("user_posts"))
+        case ExportStatus.FAILED:
+            messages.error(request, translate("Unable to export the corrections."))
+            return redirect(reverse("user_posts"))
+
+    return _render_export_pending(
+        request,
+        translate("Export corrections"),
+        reverse("export_user_corrections_status", kwargs={"job_id": job_id}),
+    )
+
+
+def _render_export_pending(request, title, status_url):
+    response = render(
+        request,
+        "corrections/export_pending.html",
+        {"title": title, "status_url": status_url},
+        status=202,
+    )
+    response["Refresh"] = str(EXPORT_PENDING_RETRY_SECONDS)
+    return response
+
+
 class UserCorrectionsView(LoginRequiredMixin, ListView):
     model = PostUserCorrection
     template_name = "corrections/user_corrections.html"
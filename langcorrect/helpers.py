@@ -1,65 +1,285 @@
+import logging
+from collections import Counter
+from functools import partial
+from functools import reduce
+from itertools import groupby
+from operator import attrgetter
+from operator import or_
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Q
+from django.db.models import Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext_noop
-from notifications.signals import notify
+from notifications.models import Notification
 
 from langcorrect.constants import NotificationTypes
 from langcorrect.users.models import User
+from langcorrect.users.models import adjust_unread_notification_counts
 
+logger = logging.getLogger(__name__)
 
-def create_notification(
-    sender: User | list[User],
-    recipient: User,
+NOTIFICATION_BULK_CHUNK_SIZE = 500
+NOTIFICATION_VERBS = {
+    NotificationTypes.NEW_CORRECTION: gettext_noop("corrected"),
+    NotificationTypes.UPDATE_CORRECTION: gettext_noop("updated their corrections on"),
+    NotificationTypes.NEW_COMMENT: gettext_noop("commented on"),
+    NotificationTypes.NEW_POST: gettext_noop("posted"),
+    NotificationTypes.NEW_REPLY: gettext_noop("replied on"),
+    NotificationTypes.NEW_FOLLOWER: gettext_noop("followed you"),
+    NotificationTypes.NEW_PROMPT_RESPONSE: gettext_noop("responded to your prompt"),
+}
+
+
+def bulk_create_notifications(  # noqa: PLR0913
+    sender: User,
+    *,
+    recipient_ids: list[int],
+    verb: str,
     action_object: any,
     n_type: NotificationTypes,
-) -> None:
-    match n_type:
-        case NotificationTypes.NEW_CORRECTION:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("corrected"),
-                action_object=action_object,
-                notification_type=NotificationTypes.NEW_CORRECTION,
-            )
-        case NotificationTypes.UPDATE_CORRECTION:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("updated their corrections on"),
-                action_object=action_object,
-                notification_type=NotificationTypes.UPDATE_CORRECTION,
-            )
-        case NotificationTypes.NEW_COMMENT:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("commented on"),
-                action_object=action_object,
-                notification_type=NotificationTypes.NEW_COMMENT,
-            )
-        case NotificationTypes.NEW_POST:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("posted"),
-                action_object=action_object,
-                notification_type=NotificationTypes.NEW_POST,
+    chunk_size: int = NOTIFICATION_BULK_CHUNK_SIZE,
+) -> int:
+    """
+    Inserts one notification per recipient with bulk_create, chunk_size rows
+    at a time. The rows match what notify.send would have created. Duplicate
+    recipients are notified once.
+
+    Returns the number of notifications created.
+    """
+    recipient_ids = list(dict.fromkeys(recipient_ids))
+    actor_content_type = ContentType.objects.get_for_model(sender)
+    action_object_content_type = ContentType.objects.get_for_model(action_object)
+    timestamp = timezone.now()
+    total_created = 0
+
+    for start in range(0, len(recipient_ids), chunk_size):
+        notifications = [
+            Notification(
+                recipient_id=recipient_id,
+                actor_content_type=actor_content_type,
+                actor_object_id=sender.pk,
+                verb=str(verb),
+                action_object_content_type=action_object_content_type,
+                action_object_object_id=action_object.pk,
+                timestamp=timestamp,
+                data={"notification_type": n_type},
             )
-        case NotificationTypes.NEW_REPLY:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("replied on"),
-                action_object=action_object,
-                notification_type=NotificationTypes.NEW_REPLY,
+            for recipient_id in recipient_ids[start : start + chunk_size]
+        ]
+        Notification.objects.bulk_create(notifications)
+        # bulk_create doesn't send post_save, so bump the counters here
+        adjust_unread_notification_counts(
+            {notification.recipient_id: 1 for notification in notifications},
+        )
+        total_created += len(notifications)
+
+    return total_created
+
+
+def mark_notifications_as_read(user: User, notification_ids=None) -> int:
+    """
+    Marks the user's notifications with the given ids, or all of them, as read
+    and updates the unread counter. Returns the number of notifications marked.
+    """
+    notifications = Notification.objects.filter(recipient=user, unread=True)
+
+    if notification_ids is not None:
+        notifications = notifications.filter(id__in=notification_ids)
+
+    marked = notifications.update(unread=False)
+    adjust_unread_notification_counts({user.id: -marked})
+    return marked
+
+
+def reconcile_unread_notification_counts() -> int:
+    """
+    Recounts the unread notifications of the users whose counter drifted.
+    Returns the number of users fixed.
+    """
+    unread_counts = Coalesce(
+        Subquery(
+            Notification.objects.filter(recipient=OuterRef("pk"), unread=True)
+            .order_by()
+            .values("recipient")
+            .annotate(count=Count("id"))
+            .values("count"),
+        ),
+        0,
+    )
+
+    return (
+        User.all_objects.alias(actual_count=unread_counts)
+        .exclude(unread_notification_count=F("actual_count"))
+        .update(unread_notification_count=unread_counts)
+    )
+
+
+NOTIFICATION_GROUP_FIELDS = (
+    "recipient_id",
+    "verb",
+    "action_object_content_type_id",
+    "action_object_object_id",
+)
+
+
+def compact_notifications(before, batch_size=NOTIFICATION_BULK_CHUNK_SIZE) -> int:
+    """
+    Coalesces the read notifications from before the given datetime that share
+    a recipient, verb and action object into the latest of them, which keeps
+    how many others it stands for in data["others_count"].
+
+    Groups are walked in order, batch_size at a time, and each batch's
+    notifications are fetched with one query and compacted in their own short
+    transaction. Returns the number of notifications deleted.
+    """
+    old_notifications = Notification.objects.filter(unread=False, timestamp__lt=before)
+    groups = (
+        old_notifications.filter(action_object_object_id__isnull=False)
+        .order_by(*NOTIFICATION_GROUP_FIELDS)
+        .values(*NOTIFICATION_GROUP_FIELDS)
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list(*NOTIFICATION_GROUP_FIELDS)
+    )
+    total_deleted = 0
+    last_group = None
+
+    while batch := list(groups.filter(_get_group_seek_filter(last_group))[:batch_size]):
+        last_group = batch[-1]
+        notifications = old_notifications.filter(
+            reduce(
+                or_,
+                (
+                    Q(**dict(zip(NOTIFICATION_GROUP_FIELDS, group, strict=True)))
+                    for group in batch
+                ),
+            ),
+        ).order_by(*NOTIFICATION_GROUP_FIELDS, "-timestamp", "-id")
+
+        with transaction.atomic():
+            compacted = []
+            deleted_ids = []
+
+            for _, group_notifications in groupby(
+                notifications,
+                key=attrgetter(*NOTIFICATION_GROUP_FIELDS),
+            ):
+                latest, *others = group_notifications
+                # Notifications compacted by a previous run stand for others too
+                others_count = (latest.data or {}).get("others_count", 0) + sum(
+                    1 + (notification.data or {}).get("others_count", 0)
+                    for notification in others
+                )
+                latest.data = {**(latest.data or {}), "others_count": others_count}
+                compacted.append(latest)
+                deleted_ids.extend(notification.id for notification in others)
+
+            Notification.objects.bulk_update(compacted, ["data"])
+            Notification.objects.filter(id__in=deleted_ids).delete()
+            total_deleted += len(deleted_ids)
+
+    return total_deleted
+
+
+def _get_group_seek_filter(group) -> Q:
+    """Matches the notification groups that sort after the given one, if any."""
+    seek_filter = Q()
+
+    if group is None:
+        return seek_filter
+
+    for i, field_name in enumerate(NOTIFICATION_GROUP_FIELDS):
+        condition = dict(zip(NOTIFICATION_GROUP_FIELDS[:i], group, strict=False))
+        condition[f"{field_name}__gt"] = group[i]
+        seek_filter |= Q(**condition)
+
+    return seek_filter
+
+
+def delete_old_notifications(before, batch_size=NOTIFICATION_BULK_CHUNK_SIZE) -> int:
+    """
+    Deletes the notifications from before the given datetime, batch_size at a
+    time so that no transaction holds locks for long. Returns the number of
+    notifications deleted.
+    """
+    old_notifications = Notification.objects.filter(timestamp__lt=before)
+    total_deleted = 0
+
+    while batch := list(
+        old_notifications.order_by("id").values_list("id", "recipient_id", "unread")[
+            :batch_size
+        ],
+    ):
+        with transaction.atomic():
+            ids = [notification_id for notification_id, _, _ in batch]
+            unread_counts = Counter(
+                recipient_id for _, recipient_id, unread in batch if unread
             )
-        case NotificationTypes.NEW_FOLLOWER:
-            notify.send(
-                sender=sender,
-                recipient=recipient,
-                verb=gettext_noop("followed you"),
-                action_object=action_object,
-                notification_type=NotificationTypes.NEW_FOLLOWER,
+
+            # Mark them read first so the counters are updated once per user
+            # instead of once per deleted notification
+            Notification.objects.filter(id__in=ids, unread=True).update(unread=False)
+            adjust_unread_notification_counts(
+                {recipient_id: -count for recipient_id, count in unread_counts.items()},
             )
-        case _:
-            # TODO: add logger for non existant
-            pass
+            Notification.objects.filter(id__in=ids).delete()
+
+        total_deleted += len(ids)
+
+    return total_deleted
+
+
+def create_notification(
+    sender: User,
+    recipient: User | list[User],
+    action_object: any,
+    n_type: NotificationTypes,
+    defer: bool = False,  # noqa: FBT001, FBT002
+) -> int:
+    """
+    Notifies one or many recipients, see bulk_create_notifications. With
+    defer=True the notifications are created by a Celery worker once the
+    current transaction commits, for large fan outs.
+
+    Returns the number of notifications created, 0 when deferred.
+    """
+    verb = NOTIFICATION_VERBS.get(n_type)
+
+    if verb is None:
+        logger.warning("Unknown notification type %s.", n_type)
+        return 0
+
+    recipients = recipient if isinstance(recipient, list | tuple | set) else [recipient]
+    recipient_ids = [user.id for user in recipients if user is not None]
+
+    if not recipient_ids:
+        return 0
+
+    if defer:
+        from langcorrect.users.tasks import create_notifications_task
+
+        transaction.on_commit(
+            partial(
+                create_notifications_task.delay,
+                sender.id,
+                recipient_ids,
+                ContentType.objects.get_for_model(action_object).id,
+                action_object.pk,
+                n_type,
+            ),
+        )
+        return 0
+
+    return bulk_create_notifications(
+        sender=sender,
+        recipient_ids=recipient_ids,
+        verb=verb,
+        action_object=action_object,
+        n_type=n_type,
+    )
@@ -78,7 +78,7 @@ class LanguageLevelDeleteView(
         if not request.user.is_authenticated:
             raise PermissionDenied
 
-        studying_language_count = request.user.studying_languages.count()
+        studying_language_count = len(request.user.studying_language_ids)
         err_msg = "You must have at least one studying language."
 
         if studying_language_count == 1:
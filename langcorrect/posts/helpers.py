@@ -1,31 +1,80 @@
 # ruff: noqa: FBT002
+from functools import partial
+
 from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField
+from django.db.models import Count
+from django.db.models import Exists
+from django.db.models import F
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.follows.models import Follower
+from langcorrect.languages.models import LevelChoices
 from langcorrect.posts.models import Post
+from langcorrect.posts.models import PostLanguageCount
+from langcorrect.utils.caching import get_cached
+
+POST_LANGUAGE_COUNTS_CACHE_TIMEOUT = 60
 
 
 def update_post_correction_status(post: Post, *, status: bool) -> None:
-    correction_count = post.correctors_count
+    post.corrector_count = PostUserCorrection.available_objects.filter(
+        post=post,
+    ).count()
 
-    if correction_count == 0:
+    if post.corrector_count == 0:
         post.is_corrected = False
     else:
         post.is_corrected = status
 
-    post.save()
+    post.save(update_fields=["is_corrected", "corrector_count"])
+
+
+def get_post_counts_by_language(languages, corrected=False, cached=False):
+    """
+    Returns a {language: post count} dict for the given languages, read from
+    the PostLanguageCount table in a single query.
+
+    With cached, the counts of all languages are read from the cache instead
+    and may be up to a minute old.
+    """
+    languages = list(languages)
+
+    if cached:
+        counts = get_cached(
+            f"post_language_counts_{'corrected' if corrected else 'uncorrected'}",
+            partial(_get_post_language_counts, corrected),
+            timeout=POST_LANGUAGE_COUNTS_CACHE_TIMEOUT,
+        )
+    else:
+        counts = _get_post_language_counts(corrected, languages)
 
+    return {language: max(counts.get(language.id, 0), 0) for language in languages}
 
-def get_post_counts_by_language(languages, corrected=False):
-    data = {}
 
-    for language in languages:
-        count = Post.available_objects.filter(
-            language=language,
-            is_corrected=corrected,
-        ).count()
-        data[language] = count
+def annotate_is_corrected_by_viewer(queryset, user):
+    """
+    Annotates the posts with whether the user has corrected them, read by
+    render_post_card instead of querying each post's correctors.
+    """
+    if user.is_anonymous:
+        return queryset.annotate(
+            is_corrected_by_viewer=Value(value=False, output_field=BooleanField()),
+        )
 
-    return data
+    return queryset.annotate(
+        is_corrected_by_viewer=Exists(
+            PostUserCorrection.available_objects.filter(
+                post=OuterRef("pk"),
+                user=user,
+            ),
+        ),
+    )
 
 
 def check_can_create_post(user):
@@ -55,3 +104,76 @@ def check_can_create_post(user):
     ):
         return True
     return False
+
+
+def get_follower_notification_recipient_ids(post):
+    """
+    Returns the ids of the author's followers who want notifications and are
+    native speakers of the post's language, using a single query.
+    """
+    return list(
+        Follower.objects.filter(
+            follow_to_id=post.user_id,
+            get_notification=True,
+            user__is_active=True,
+            user__languagelevel__language_id=post.language_id,
+            user__languagelevel__level=LevelChoices.NATIVE,
+        )
+        .values_list("user_id", flat=True)
+        .distinct(),
+    )
+
+
+def _get_post_language_counts(corrected, languages=None):
+    counters = PostLanguageCount.objects.filter(is_corrected=corrected)
+
+    if languages is not None:
+        counters = counters.filter(language__in=languages)
+
+    return dict(counters.values_list("language_id", "count"))
+
+
+def reconcile_post_language_counts():
+    """
+    Rebuilds PostLanguageCount from the posts table, fixing any drift left by
+    writes that bypassed the Post signals (queryset updates, failed commits).
+    """
+    with transaction.atomic():
+        PostLanguageCount.objects.update(count=0)
+
+        actual_counts = (
+            Post.available_objects.order_by()
+            .values("language_id", "is_corrected")
+            .annotate(count=Count("id"))
+        )
+        counters = PostLanguageCount.objects.bulk_create(
+            [PostLanguageCount(**row) for row in actual_counts],
+            update_conflicts=True,
+            unique_fields=["language", "is_corrected"],
+            update_fields=["count"],
+        )
+
+    return len(counters)
+
+
+def reconcile_post_corrector_counts():
+    """
+    Recounts the correctors of the posts whose corrector_count drifted from
+    the corrections table. Returns the number of posts fixed.
+    """
+    corrector_counts = Coalesce(
+        Subquery(
+            PostUserCorrection.available_objects.filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(count=Count("id"))
+            .values("count"),
+        ),
+        0,
+    )
+
+    return (
+        Post.all_objects.alias(actual_count=corrector_counts)
+        .exclude(corrector_count=F("actual_count"))
+        .update(corrector_count=corrector_counts)
+    )
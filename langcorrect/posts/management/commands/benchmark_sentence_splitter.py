@@ -0,0 +1,55 @@
+# ruff: noqa: RUF001
+import time
+
+from django.core.management.base import BaseCommand
+from fugashi import Tagger
+
+from langcorrect.posts.utils import SentenceSplitter
+
+SAMPLE_TEXTS = {
+    "en": "Today I went to the park. The weather was great! I want to go again.",
+    "ja": "今日は公園に行きました。天気がとても良かったです！また行きたいです。",
+    "zh-hans": "今天我去了公园。天气很好！我还想再去。",
+}
+
+
+def _time_per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-call cost of SentenceSplitter: the first (cold) call, "
+        "calls on the shared tokenizers, and a fresh fugashi Tagger per call "
+        "(the previous Japanese behaviour)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        splitter = SentenceSplitter()
+
+        for lang_code, text in SAMPLE_TEXTS.items():
+            first_call = _time_per_call(
+                lambda: splitter.split_sentences(text, lang_code),  # noqa: B023
+                1,
+            )
+            shared = _time_per_call(
+                lambda: splitter.split_sentences(text, lang_code),  # noqa: B023
+                iterations,
+            )
+            self.stdout.write(
+                f"{lang_code}: first call {first_call:.2f} ms, "
+                f"shared tokenizer {shared:.3f} ms/call",
+            )
+
+        fresh_tagger = _time_per_call(
+            lambda: list(Tagger()(SAMPLE_TEXTS["ja"])),
+            iterations,
+        )
+        self.stdout.write(f"ja: fresh Tagger per call {fresh_tagger:.2f} ms/call")
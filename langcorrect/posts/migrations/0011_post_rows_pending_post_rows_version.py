@@ -0,0 +1,23 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_uuid_postrow_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='rows_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='rows_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
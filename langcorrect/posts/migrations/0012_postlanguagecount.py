@@ -0,0 +1,45 @@
+# Generated by Django 4.2.20 on 2026-10-18 11:48
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def populate_post_language_counts(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    PostLanguageCount = apps.get_model("posts", "PostLanguageCount")
+
+    counts = (
+        Post.objects.filter(is_removed=False)
+        .order_by()
+        .values("language_id", "is_corrected")
+        .annotate(count=Count("id"))
+    )
+    PostLanguageCount.objects.bulk_create(
+        [PostLanguageCount(**row) for row in counts],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('languages', '0003_remove_languagelevel_is_removed'),
+        ('posts', '0011_post_rows_pending_post_rows_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostLanguageCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_corrected', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+                ('language', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='languages.language')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='postlanguagecount',
+            constraint=models.UniqueConstraint(fields=('language', 'is_corrected'), name='unique_language_is_corrected'),
+        ),
+        migrations.RunPython(populate_post_language_counts, migrations.RunPython.noop),
+    ]
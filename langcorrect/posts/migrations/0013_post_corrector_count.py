@@ -0,0 +1,36 @@
+# Generated by Django 4.2.20 on 2026-10-18 12:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_corrector_counts(apps, schema_editor):
+    Post = apps.get_model("posts", "Post")
+    PostUserCorrection = apps.get_model("corrections", "PostUserCorrection")
+
+    corrector_counts = (
+        PostUserCorrection.objects.filter(post=OuterRef("pk"), is_removed=False)
+        .order_by()
+        .values("post")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Post.objects.update(corrector_count=Coalesce(Subquery(corrector_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('corrections', '0010_postcorrection_correction_html_and_more'),
+        ('posts', '0012_postlanguagecount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='corrector_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_corrector_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_corrector_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_created_26d9b3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-created', '-id'], name='posts_post_created_a3cb1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['language', 'is_corrected', '-created', '-id'], name='posts_post_languag_f4d1cf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['permission', 'is_corrected', '-created', '-id'], name='posts_post_permiss_bec16a_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicate_slugs(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+
+    duplicate_slugs = (
+        Post.objects.filter(slug__isnull=False)
+        .order_by()
+        .values('slug')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('slug', flat=True)
+    )
+    for slug in duplicate_slugs:
+        # The oldest row keeps the slug
+        for obj in Post.objects.filter(slug=slug).order_by('id')[1:]:
+            obj.slug = f'{slug}-{obj.id}'
+            obj.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_remove_post_posts_post_created_26d9b3_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='post',
+            name='slug',
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -1,27 +1,39 @@
 # ruff: noqa: DJ001,RUF005
 import uuid
+from collections import defaultdict
+from collections import deque
+from functools import partial
 
 from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models.signals import post_delete
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from django.utils.translation import gettext_noop
 from model_utils.models import SoftDeletableModel
 from model_utils.models import TimeStampedModel
-from notifications.signals import notify
 from taggit.managers import TaggableManager
 
+from langcorrect.constants import NotificationTypes
+from langcorrect.contributions.models import adjust_daily_contributions
+from langcorrect.helpers import create_notification
 from langcorrect.languages.models import LevelChoices
 from langcorrect.managers import ActiveUserSoftDeleteManager
 from langcorrect.posts.utils import SentenceSplitter
 from langcorrect.users.models import GenderChoices
 from langcorrect.users.models import User
+from langcorrect.utils.slugs import get_next_slug
+from langcorrect.utils.slugs import save_with_unique_slug
 
 sentence_splitter = SentenceSplitter()
 
+COUNTER_FIELDS = {"language_id", "is_corrected", "is_removed"}
+UNKNOWN_COUNTER_KEY = object()
+
 
 class PostVisibility(models.TextChoices):
     PUBLIC = "public", _("Viewable by everyone")
@@ -31,8 +43,11 @@ class PostVisibility(models.TextChoices):
 class Post(TimeStampedModel, SoftDeletableModel):
     class Meta:
         ordering = ["-created"]
+        # Match the keyset pagination of the post feed, see PostListView
         indexes = [
-            models.Index(fields=["-created"]),
+            models.Index(fields=["-created", "-id"]),
+            models.Index(fields=["language", "is_corrected", "-created", "-id"]),
+            models.Index(fields=["permission", "is_corrected", "-created", "-id"]),
         ]
 
     objects = ActiveUserSoftDeleteManager()
@@ -61,7 +76,7 @@ class Post(TimeStampedModel, SoftDeletableModel):
         null=True,
         blank=True,
     )
-    slug = models.SlugField(max_length=255, null=True)
+    slug = models.SlugField(max_length=255, null=True, unique=True)
     tags = TaggableManager(blank=True)
     language_level = models.CharField(
         choices=LevelChoices.choices,
@@ -69,31 +84,48 @@ class Post(TimeStampedModel, SoftDeletableModel):
         max_length=2,
     )
     is_corrected = models.BooleanField(default=False)
+    corrector_count = models.PositiveIntegerField(default=0)
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
+    # Set while the post's rows are being (re)built by a Celery worker, see
+    # ASYNC_SENTENCE_SPLITTING. The version lets superseded split jobs no-op.
+    rows_pending = models.BooleanField(default=False)
+    rows_version = models.PositiveIntegerField(default=0)
+
+    # The (language_id, is_corrected) bucket this post is currently counted in
+    # by PostLanguageCount, or None if it isn't counted (unsaved or removed).
+    counted_as = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if COUNTER_FIELDS.isdisjoint(instance.get_deferred_fields()):
+            instance.counted_as = instance.get_counter_key()
+        else:
+            instance.counted_as = UNKNOWN_COUNTER_KEY
+        return instance
+
+    def get_counter_key(self):
+        if self.is_removed:
+            return None
+        return (self.language_id, self.is_corrected)
 
     def get_absolute_url(self) -> str:
         return reverse("posts:detail", kwargs={"slug": self.slug})
 
     def save(self, *args, **kwargs):
         if not self.slug and not self.is_draft:
-            new_slug = generated_slug = slugify(self.title, allow_unicode=True)
-
-            if not new_slug:
-                count = 1
-                generated_slug = f"-{count}"
-
-            if Post.all_objects.filter(slug=new_slug).exists() or not new_slug:
-                count = 1
-                while (
-                    Post.all_objects.exclude(id=self.pk)
-                    .filter(slug=generated_slug)
-                    .exists()
-                ):
-                    generated_slug = f"{new_slug}-{count}"
-                    count += 1
-            self.slug = generated_slug
-
-        super().save(*args, **kwargs)
+            return save_with_unique_slug(
+                self,
+                Post.all_objects,
+                partial(
+                    get_next_slug,
+                    Post.all_objects,
+                    slugify(self.title, allow_unicode=True),
+                ),
+                partial(super().save, *args, **kwargs),
+            )
+
+        return super().save(*args, **kwargs)
 
     @property
     def correctors(self):
@@ -101,7 +133,68 @@ class Post(TimeStampedModel, SoftDeletableModel):
 
     @property
     def correctors_count(self):
-        return self.postusercorrection_set.count()
+        return self.corrector_count
+
+
+class PostLanguageCount(models.Model):
+    """
+    Number of posts that are not removed per language and correction status.
+
+    Kept up to date by the Post signals below and periodically rebuilt from
+    the posts table by reconcile_post_language_counts.
+    """
+
+    language = models.ForeignKey("languages.Language", on_delete=models.CASCADE)
+    is_corrected = models.BooleanField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["language", "is_corrected"],
+                name="unique_language_is_corrected",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.language_id} (corrected={self.is_corrected}): {self.count}"
+
+
+def adjust_post_language_count(language_id, is_corrected, delta):
+    counters = PostLanguageCount.objects.filter(
+        language_id=language_id,
+        is_corrected=is_corrected,
+    )
+
+    if not counters.update(count=models.F("count") + delta):
+        PostLanguageCount.objects.get_or_create(
+            language_id=language_id,
+            is_corrected=is_corrected,
+        )
+        counters.update(count=models.F("count") + delta)
+
+
+def _schedule_post_counter_updates(post, old_key, new_key):
+    # Applied after commit so the hot counter rows are only locked briefly
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        transaction.on_commit(partial(adjust_post_language_count, *old_key, -1))
+    if new_key is not None:
+        transaction.on_commit(partial(adjust_post_language_count, *new_key, 1))
+
+    # Language or status changes move the post between counters, only
+    # creating, removing or restoring it changes the author's daily count
+    delta = (new_key is not None) - (old_key is not None)
+    if delta:
+        transaction.on_commit(
+            partial(
+                adjust_daily_contributions,
+                post.user_id,
+                "post_count",
+                {timezone.localdate(post.created): delta},
+            ),
+        )
 
 
 class PostImage(TimeStampedModel, SoftDeletableModel):
@@ -123,24 +216,34 @@ class PostRow(TimeStampedModel, SoftDeletableModel):
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
 
 
+@receiver(post_save, sender=Post)
+def update_post_language_counts(sender, instance, created, **kwargs):
+    if instance.counted_as is UNKNOWN_COUNTER_KEY:
+        # Loaded with deferred fields; reconciliation will pick it up
+        return
+
+    new_key = instance.get_counter_key()
+    _schedule_post_counter_updates(instance, instance.counted_as, new_key)
+    instance.counted_as = new_key
+
+
+@receiver(post_delete, sender=Post)
+def decrement_post_language_counts(sender, instance, **kwargs):
+    if instance.counted_as is UNKNOWN_COUNTER_KEY:
+        return
+
+    _schedule_post_counter_updates(instance, instance.counted_as, None)
+    instance.counted_as = None
+
+
 @receiver(post_save, sender=Post)
 def send_follower_notifications(sender, instance, created, **kwargs):
-    post = instance
-    user = post.user
+    from langcorrect.posts.tasks import notify_followers_of_new_post
 
     if created:
-        recipients = [
-            follower.user
-            for follower in user.follow_to.all()
-            if post.language in follower.user.native_languages
-        ]
-
-        notify.send(
-            sender=user,
-            recipient=recipients,
-            verb=gettext_noop("submitted a new entry"),
-            action_object=post,
-            notification_type="new_post",
+        # Fan out from a worker once the post is committed and visible to it
+        transaction.on_commit(
+            partial(notify_followers_of_new_post.delay, instance.id),
         )
 
 
@@ -152,18 +255,32 @@ def send_prompt_author_notifications(sender, instance, created, **kwargs):
     if created and post.prompt:
         recipient = post.prompt.user
 
-        notify.send(
-            sender=user,
-            recipient=recipient,
-            verb=gettext_noop("responded to your prompt"),
-            action_object=post,
-            notification_type="new_prompt_response",
+        create_notification(
+            user,
+            recipient,
+            post,
+            NotificationTypes.NEW_PROMPT_RESPONSE,
         )
 
 
+ROW_SOURCE_FIELDS = {"title", "text"}
+
+
 @receiver(post_save, sender=Post)
 def split_post_into_sentences(sender, instance, created, **kwargs):
     post = instance
+    update_fields = kwargs.get("update_fields")
+
+    if update_fields and not ROW_SOURCE_FIELDS.intersection(update_fields):
+        return
+
+    if settings.ASYNC_SENTENCE_SPLITTING:
+        schedule_post_rows_sync(post)
+    else:
+        sync_post_rows(post, created=created)
+
+
+def sync_post_rows(post, *, created=False):
     user = post.user
     post_sentences = sentence_splitter.split_sentences(post.text, post.language.code)
     title_and_sentences = [post.title] + post_sentences
@@ -174,32 +291,87 @@ def split_post_into_sentences(sender, instance, created, **kwargs):
         update_post_rows(user, post, title_and_sentences)
 
 
-def create_post_rows(user, post, sentences):
-    for idx, sentence in enumerate(sentences):
-        PostRow.objects.create(user=user, post=post, sentence=sentence, order=idx)
-
+def schedule_post_rows_sync(post):
+    """
+    Marks the post's rows as pending and queues a split job for after commit.
+    Every call bumps rows_version, so only the job for the latest edit does
+    any work when several edits arrive in quick succession.
+    """
+    from langcorrect.posts.tasks import split_post_into_sentences_task
 
-def update_post_rows(user, post, sentences):
-    all_rows = PostRow.available_objects.filter(post=post)
-    old_rows = {row.sentence: row for row in all_rows}
+    Post.all_objects.filter(id=post.id).update(
+        rows_pending=True,
+        rows_version=models.F("rows_version") + 1,
+    )
+    post.refresh_from_db(fields=["rows_pending", "rows_version"])
+
+    transaction.on_commit(
+        partial(
+            split_post_into_sentences_task.apply_async,
+            args=(post.id, post.rows_version),
+            countdown=settings.ASYNC_SENTENCE_SPLITTING_DELAY,
+        ),
+    )
 
-    for idx, sentence in enumerate(sentences):
-        if sentence in old_rows:
-            show_sentence(old_rows[sentence], idx)
-        else:
-            PostRow.objects.create(user=user, post=post, sentence=sentence, order=idx)
 
-    hide_removed_sentences(old_rows, sentences)
+def create_post_rows(user, post, sentences):
+    PostRow.available_objects.bulk_create(
+        [
+            PostRow(user=user, post=post, sentence=sentence, order=idx)
+            for idx, sentence in enumerate(sentences)
+        ],
+    )
 
 
-def show_sentence(post_row, order):
-    post_row.is_actual = True
-    post_row.order = order
-    post_row.save()
+def update_post_rows(user, post, sentences):
+    """
+    Reconciles the post's rows with the new list of sentences.
+
+    Existing rows are reused by sentence text (one row per occurrence, so
+    duplicate sentences keep their own rows), preferring rows that are already
+    shown. Unmatched sentences get new rows and leftover rows are hidden. All
+    changes are written with one bulk_create and one bulk_update.
+    """
+    existing_rows = PostRow.available_objects.filter(post=post).order_by(
+        "-is_actual",
+        "order",
+        "id",
+    )
+    rows_by_sentence = defaultdict(deque)
+    for row in existing_rows:
+        rows_by_sentence[row.sentence].append(row)
 
+    now = timezone.now()
+    new_rows = []
+    changed_rows = []
 
-def hide_removed_sentences(old_rows, sentences):
-    for sentence, row in old_rows.items():
-        if sentence not in sentences:
-            row.is_actual = False
-            row.save()
+    for idx, sentence in enumerate(sentences):
+        matching_rows = rows_by_sentence.get(sentence)
+
+        if not matching_rows:
+            new_rows.append(
+                PostRow(user=user, post=post, sentence=sentence, order=idx),
+            )
+            continue
+
+        row = matching_rows.popleft()
+        if not row.is_actual or row.order != idx:
+            row.is_actual = True
+            row.order = idx
+            row.modified = now
+            changed_rows.append(row)
+
+    for unused_rows in rows_by_sentence.values():
+        for row in unused_rows:
+            if row.is_actual:
+                row.is_actual = False
+                row.modified = now
+                changed_rows.append(row)
+
+    if new_rows:
+        PostRow.available_objects.bulk_create(new_rows)
+    if changed_rows:
+        PostRow.available_objects.bulk_update(
+            changed_rows,
+            ["is_actual", "order", "modified"],
+        )
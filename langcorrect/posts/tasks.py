@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.utils.translation import gettext_noop
+
+from config import celery_app
+from langcorrect.constants import NotificationTypes
+from langcorrect.helpers import bulk_create_notifications
+from langcorrect.posts.helpers import get_follower_notification_recipient_ids
+from langcorrect.posts.helpers import reconcile_post_corrector_counts
+from langcorrect.posts.helpers import reconcile_post_language_counts
+from langcorrect.posts.models import Post
+from langcorrect.posts.models import sync_post_rows
+
+
+@celery_app.task()
+def notify_followers_of_new_post(post_id, chunk_size=500):
+    """
+    Notifies the author's followers about a new post. Returns the number of
+    notifications created.
+    """
+    post = Post.available_objects.select_related("user").filter(id=post_id).first()
+
+    if post is None:
+        return 0
+
+    recipient_ids = get_follower_notification_recipient_ids(post)
+
+    return bulk_create_notifications(
+        sender=post.user,
+        recipient_ids=recipient_ids,
+        verb=gettext_noop("submitted a new entry"),
+        action_object=post,
+        n_type=NotificationTypes.NEW_POST,
+        chunk_size=chunk_size,
+    )
+
+
+@celery_app.task()
+def split_post_into_sentences_task(post_id, rows_version):
+    """
+    Rebuilds the post's rows for the given rows_version. Returns False when the
+    post is gone or a newer edit has superseded this job.
+    """
+    with transaction.atomic():
+        post = (
+            Post.all_objects.select_for_update(of=("self",))
+            .select_related("user", "language")
+            .filter(id=post_id)
+            .first()
+        )
+
+        if post is None or post.rows_version != rows_version:
+            return False
+
+        sync_post_rows(post)
+        Post.all_objects.filter(id=post_id).update(rows_pending=False)
+
+    return True
+
+
+@celery_app.task()
+def reconcile_post_language_counts_task():
+    """Scheduled nightly through CELERY_BEAT_SCHEDULE."""
+    return reconcile_post_language_counts()
+
+
+@celery_app.task()
+def reconcile_post_corrector_counts_task():
+    """Scheduled nightly through CELERY_BEAT_SCHEDULE."""
+    return reconcile_post_corrector_counts()
@@ -15,9 +15,9 @@ def get_url(context, kind, param):
         if value:
             params.append(f"{key}={value}")
 
-    def add_params_except(except_key):
+    def add_params_except(*except_keys):
         for key in context.request.GET:
-            if key != except_key:
+            if key not in except_keys:
                 values = context.request.GET.getlist(key)
                 for value in values:
                     params.append(f"{key}={value}")
@@ -33,8 +33,12 @@ def get_url(context, kind, param):
         add_param("language", current_lang)
         add_param("page", current_page)
         add_param("filter", param)
+    elif kind == "cursor":
+        # Cursors replace page numbers, see CursorPaginator
+        add_param("cursor", param)
+        add_params_except("cursor", "page")
     elif kind == "mode":
         add_param("mode", param if param != "teach" else None)
-        add_params_except("mode")
+        add_params_except("mode", "cursor")
 
     return context.request.path + ("?" + "&".join(params) if params else "")
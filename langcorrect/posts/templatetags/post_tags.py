@@ -8,7 +8,7 @@ register = template.Library()
 def render_post_card(
     instance,
     current_user,
-    correctors,
+    correctors=None,
     disable_native_text=False,
     disable_stretched_link=False,
     disable_text_truncation=False,
@@ -17,10 +17,11 @@ def render_post_card(
     created = instance.created
     post = instance
 
-    already_corrected = False
+    # Feed querysets annotate this with an EXISTS subquery
+    already_corrected = getattr(instance, "is_corrected_by_viewer", None)
 
-    if current_user in correctors:
-        already_corrected = True
+    if already_corrected is None:
+        already_corrected = correctors is not None and current_user in correctors
 
     return {
         "user": user,
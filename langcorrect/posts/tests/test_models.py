@@ -0,0 +1,191 @@
+# ruff: noqa: PT009
+import pytest
+from django.test import TestCase
+
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.languages.models import Language
+from langcorrect.posts.helpers import get_post_counts_by_language
+from langcorrect.posts.helpers import reconcile_post_corrector_counts
+from langcorrect.posts.helpers import reconcile_post_language_counts
+from langcorrect.posts.models import Post
+from langcorrect.posts.models import PostLanguageCount
+from langcorrect.posts.models import PostRow
+from langcorrect.posts.models import update_post_rows
+from langcorrect.users.tests.factories import UserFactory
+from langcorrect.utils.slugs import get_next_slug
+
+
+class TestPostRowSync(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.post = Post.objects.create(
+            user=self.user,
+            language=self.en_lang,
+            title="My day",
+            text="I woke up. I ate. I slept.",
+        )
+
+    def get_actual_sentences(self):
+        return list(
+            PostRow.available_objects.filter(post=self.post, is_actual=True)
+            .order_by("order")
+            .values_list("sentence", flat=True),
+        )
+
+    def test_rows_created_in_order(self):
+        self.assertEqual(
+            self.get_actual_sentences(),
+            ["My day", "I woke up.", "I ate.", "I slept."],
+        )
+
+    def test_update_reuses_and_hides_rows(self):
+        ate_row = PostRow.available_objects.get(post=self.post, sentence="I ate.")
+
+        update_post_rows(self.user, self.post, ["My day", "I ate.", "I ran."])
+
+        self.assertEqual(self.get_actual_sentences(), ["My day", "I ate.", "I ran."])
+        ate_row.refresh_from_db()
+        self.assertEqual(ate_row.order, 1)
+        self.assertFalse(
+            PostRow.available_objects.get(
+                post=self.post,
+                sentence="I slept.",
+            ).is_actual,
+        )
+
+    def test_update_handles_duplicate_sentences(self):
+        sentences = ["My day", "I ate.", "I ate.", "I slept."]
+
+        update_post_rows(self.user, self.post, sentences)
+
+        self.assertEqual(self.get_actual_sentences(), sentences)
+        self.assertEqual(
+            PostRow.available_objects.filter(post=self.post, sentence="I ate.").count(),
+            2,
+        )
+
+        update_post_rows(self.user, self.post, ["My day", "I ate."])
+
+        self.assertEqual(self.get_actual_sentences(), ["My day", "I ate."])
+        self.assertEqual(
+            PostRow.available_objects.filter(post=self.post, sentence="I ate.").count(),
+            2,
+        )
+
+    def test_update_query_count_is_constant(self):
+        sentences = ["My day"] + [f"Sentence number {i}." for i in range(50)]
+
+        with self.assertNumQueries(3):
+            update_post_rows(self.user, self.post, sentences)
+
+
+class TestPostLanguageCount(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+
+    def get_counts(self):
+        return {
+            True: get_post_counts_by_language([self.en_lang], corrected=True)[
+                self.en_lang
+            ],
+            False: get_post_counts_by_language([self.en_lang])[self.en_lang],
+        }
+
+    @pytest.mark.usefixtures("_mock_notify")
+    def test_counts_follow_post_lifecycle(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            post = Post.objects.create(
+                user=self.user,
+                language=self.en_lang,
+                title="My day",
+                text="I woke up.",
+            )
+        self.assertEqual(self.get_counts(), {True: 0, False: 1})
+
+        post = Post.objects.get(id=post.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.is_corrected = True
+            post.save(update_fields=["is_corrected"])
+        self.assertEqual(self.get_counts(), {True: 1, False: 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.get_counts(), {True: 0, False: 0})
+
+    def test_reconcile_fixes_drift(self):
+        Post.objects.create(
+            user=self.user,
+            language=self.en_lang,
+            title="My day",
+            text="I woke up.",
+        )
+        PostLanguageCount.objects.create(
+            language=self.en_lang,
+            is_corrected=True,
+            count=42,
+        )
+
+        reconcile_post_language_counts()
+
+        self.assertEqual(self.get_counts(), {True: 0, False: 1})
+
+    def test_reconcile_corrector_counts(self):
+        post = Post.objects.create(
+            user=self.user,
+            language=self.en_lang,
+            title="My day",
+            text="I woke up.",
+        )
+        correctors = UserFactory.create_batch(2)
+        for corrector in correctors:
+            PostUserCorrection.available_objects.create(post=post, user=corrector)
+        Post.objects.filter(id=post.id).update(corrector_count=5)
+
+        self.assertEqual(reconcile_post_corrector_counts(), 1)
+        post.refresh_from_db()
+        self.assertEqual(post.corrector_count, len(correctors))
+        self.assertEqual(reconcile_post_corrector_counts(), 0)
+
+
+class TestPostSlug(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+
+    def create_post(self, title, **kwargs):
+        return Post.objects.create(
+            user=self.user,
+            language=self.en_lang,
+            title=title,
+            text="I woke up.",
+            **kwargs,
+        )
+
+    def test_slugs_get_the_next_free_suffix(self):
+        slugs = [self.create_post("My day").slug for _ in range(3)]
+        self.assertEqual(slugs, ["my-day", "my-day-1", "my-day-2"])
+
+        # Unrelated slugs sharing the prefix are ignored
+        self.create_post("My day off")
+        self.assertEqual(self.create_post("My day").slug, "my-day-3")
+
+    def test_titles_without_slug(self):
+        slugs = [self.create_post("!!!").slug for _ in range(2)]
+        self.assertEqual(slugs, ["-1", "-2"])
+
+    def test_drafts_have_no_slug(self):
+        post = self.create_post("My day", is_draft=True)
+        self.assertIsNone(post.slug)
+
+        post.is_draft = False
+        post.save()
+        self.assertEqual(post.slug, "my-day")
+
+    def test_next_slug_is_one_query(self):
+        for _ in range(5):
+            self.create_post("My day")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_next_slug(Post.all_objects, "my-day"), "my-day-5")
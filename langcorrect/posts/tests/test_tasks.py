@@ -0,0 +1,101 @@
+# ruff: noqa: PT009
+from django.test import TestCase
+
+from langcorrect.follows.models import Follower
+from langcorrect.languages.models import Language
+from langcorrect.languages.models import LanguageLevel
+from langcorrect.languages.models import LevelChoices
+from langcorrect.posts.models import Post
+from langcorrect.posts.tasks import notify_followers_of_new_post
+from langcorrect.posts.tasks import split_post_into_sentences_task
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestNotifyFollowersOfNewPost(TestCase):
+    def setUp(self):
+        self.author = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.de_lang = Language.objects.create(code="de", en_name="German")
+        self.post = Post.objects.create(
+            user=self.author,
+            language=self.en_lang,
+            title="My day",
+            text="Today I went to the park.",
+        )
+
+    def create_follower(self, language, level, get_notification=True):  # noqa: FBT002
+        user = UserFactory()
+        LanguageLevel.objects.create(user=user, language=language, level=level)
+        Follower.objects.create(
+            user=user,
+            follow_to=self.author,
+            get_notification=get_notification,
+        )
+        return user
+
+    def test_only_eligible_followers_are_notified(self):
+        native = self.create_follower(self.en_lang, LevelChoices.NATIVE)
+        learner = self.create_follower(self.en_lang, LevelChoices.B1)
+        other_native = self.create_follower(self.de_lang, LevelChoices.NATIVE)
+        muted = self.create_follower(
+            self.en_lang,
+            LevelChoices.NATIVE,
+            get_notification=False,
+        )
+
+        sent_count = notify_followers_of_new_post(self.post.id)
+
+        self.assertEqual(sent_count, 1)
+        self.assertEqual(native.notifications.count(), 1)
+        self.assertEqual(learner.notifications.count(), 0)
+        self.assertEqual(other_native.notifications.count(), 0)
+        self.assertEqual(muted.notifications.count(), 0)
+
+        notification = native.notifications.get()
+        self.assertEqual(notification.action_object, self.post)
+        self.assertEqual(notification.actor, self.author)
+        self.assertEqual(notification.data["notification_type"], "new_post")
+
+    def test_missing_post(self):
+        self.assertEqual(notify_followers_of_new_post(0), 0)
+
+
+class TestSplitPostIntoSentencesTask(TestCase):
+    def setUp(self):
+        self.author = UserFactory()
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+
+    def create_post(self):
+        with self.settings(ASYNC_SENTENCE_SPLITTING=True):
+            return Post.objects.create(
+                user=self.author,
+                language=self.en_lang,
+                title="My day",
+                text="I woke up. I ate.",
+            )
+
+    def test_post_save_defers_splitting(self):
+        post = self.create_post()
+
+        self.assertTrue(post.rows_pending)
+        self.assertFalse(post.postrow_set.exists())
+
+        self.assertTrue(split_post_into_sentences_task(post.id, post.rows_version))
+
+        post.refresh_from_db()
+        self.assertFalse(post.rows_pending)
+        self.assertEqual(post.postrow_set.filter(is_actual=True).count(), 3)
+
+    def test_superseded_job_is_skipped(self):
+        post = self.create_post()
+        stale_version = post.rows_version
+
+        with self.settings(ASYNC_SENTENCE_SPLITTING=True):
+            post.text = "I woke up. I ate. I slept."
+            post.save()
+
+        self.assertFalse(split_post_into_sentences_task(post.id, stale_version))
+        self.assertFalse(post.postrow_set.exists())
+
+        self.assertTrue(split_post_into_sentences_task(post.id, post.rows_version))
+        self.assertEqual(post.postrow_set.filter(is_actual=True).count(), 4)
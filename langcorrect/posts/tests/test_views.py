@@ -0,0 +1,134 @@
+# ruff: noqa: PT009
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from langcorrect.corrections.models import PostUserCorrection
+from langcorrect.languages.models import Language
+from langcorrect.languages.models import LanguageLevel
+from langcorrect.languages.models import LevelChoices
+from langcorrect.posts.models import Post
+from langcorrect.posts.views import PostListView
+from langcorrect.users.tests.factories import UserFactory
+
+
+class TestPostListView(TestCase):
+    def setUp(self):
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.ja_lang = Language.objects.create(code="ja", en_name="Japanese")
+        self.viewer = self.create_user(native=self.en_lang, studying=self.ja_lang)
+        self.client.force_login(self.viewer)
+
+    def create_user(self, native, studying):
+        user = UserFactory()
+        LanguageLevel.objects.create(
+            user=user,
+            language=native,
+            level=LevelChoices.NATIVE,
+        )
+        LanguageLevel.objects.create(
+            user=user,
+            language=studying,
+            level=LevelChoices.B1,
+        )
+        return user
+
+    def create_posts(self, count):
+        for i in range(count):
+            Post.objects.create(
+                user=self.create_user(native=self.ja_lang, studying=self.en_lang),
+                language=self.en_lang,
+                title=f"My day {i}",
+                text="Today I went to the park.",
+            )
+
+    def get_query_count(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("posts:list"))
+
+        self.assertEqual(response.status_code, 200)
+        return len(context), len(response.context["object_list"])
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        self.create_posts(2)
+        self.get_query_count()  # warm up caches (top correctors, content types)
+        small_page_queries, small_page_size = self.get_query_count()
+
+        self.create_posts(10)
+        large_page_queries, large_page_size = self.get_query_count()
+
+        self.assertEqual(small_page_size, 2)
+        self.assertEqual(large_page_size, 12)
+        self.assertEqual(small_page_queries, large_page_queries)
+
+    @patch.object(PostListView, "paginate_by", 2)
+    @override_settings(CURSOR_PAGINATION=True)
+    def test_cursor_pagination(self):
+        self.create_posts(5)
+        expected = list(
+            Post.objects.filter(language=self.en_lang)
+            .order_by("-created", "-id")
+            .values_list("id", flat=True),
+        )
+
+        pages = []
+        url = reverse("posts:list")
+        while url:
+            response = self.client.get(url)
+            page = response.context["page_obj"]
+            pages.append([post.id for post in page])
+            url = (
+                f"{reverse('posts:list')}?cursor={page.next_cursor}"
+                if page.has_next()
+                else None
+            )
+
+        self.assertEqual(pages, [expected[:2], expected[2:4], expected[4:]])
+
+        response = self.client.get(
+            f"{reverse('posts:list')}?cursor={page.previous_cursor}",
+        )
+        previous_page = response.context["page_obj"]
+        self.assertEqual([post.id for post in previous_page], expected[2:4])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{reverse('posts:list')}?cursor=invalid")
+        self.assertEqual(response.status_code, 404)
+
+    @patch.object(PostListView, "paginate_by", 2)
+    def test_page_numbers_by_default(self):
+        self.create_posts(3)
+
+        response = self.client.get(f"{reverse('posts:list')}?page=2")
+        page = response.context["page_obj"]
+        self.assertFalse(getattr(page.paginator, "is_cursor", False))
+        self.assertEqual(page.number, 2)
+        self.assertEqual(len(page), 1)
+
+
+class TestPostDetailView(TestCase):
+    def setUp(self):
+        self.en_lang = Language.objects.create(code="en", en_name="English")
+        self.viewer = UserFactory()
+        self.post = Post.objects.create(
+            user=UserFactory(),
+            language=self.en_lang,
+            title="My day",
+            text="Today I went to the park.",
+        )
+        self.client.force_login(self.viewer)
+
+    def get_post(self):
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertEqual(response.status_code, 200)
+        return response.context["post"]
+
+    def test_is_corrected_by_viewer(self):
+        self.assertFalse(self.get_post().is_corrected_by_viewer)
+
+        PostUserCorrection.available_objects.create(post=self.post, user=self.viewer)
+        self.assertTrue(self.get_post().is_corrected_by_viewer)
@@ -2,6 +2,7 @@ from django.urls import path
 
 from langcorrect.corrections.api.views import CommentCreateUpdateAPIView
 from langcorrect.corrections.views import export_corrections
+from langcorrect.corrections.views import export_corrections_status
 from langcorrect.corrections.views import make_corrections
 from langcorrect.posts.views import PostRestrictedView
 from langcorrect.posts.views import post_create_view
@@ -34,4 +35,9 @@ urlpatterns = [
         export_corrections,
         name="export-corrections",
     ),
+    path(
+        "<str:slug>/export_corrections/status",
+        export_corrections_status,
+        name="export-corrections-status",
+    ),
 ]
@@ -1,10 +1,21 @@
 # ruff: noqa: RUF001
+import logging
 import re
+import threading
 
 import jieba
+from django.conf import settings
 from fugashi import Tagger
 from nltk.tokenize import sent_tokenize
 
+logger = logging.getLogger(__name__)
+
+# Loading UniDic is expensive, so the process shares one tagger. A MeCab
+# tagger must not be used by two threads at the same time, hence the lock.
+# The punkt tokenizers are already cached per language by nltk.
+_tagger_lock = threading.Lock()
+_tagger = None
+
 
 class SentenceSplitter:
     def __init__(self):
@@ -49,26 +60,52 @@ class SentenceSplitter:
         self.terminators = [".", "!", "?"]
         self.ja_zh_terminators = ["。", "！", "？"]
 
+    @staticmethod
+    def _get_japanese_tagger():
+        """Returns the shared tagger, only use it while holding _tagger_lock."""
+        global _tagger  # noqa: PLW0603
+        if _tagger is None:
+            _tagger = Tagger()
+        return _tagger
+
+    def warm_up(self, lang_codes=None):
+        """
+        Loads the tokenizers for the given language codes (all supported ones
+        by default) so the first request after boot doesn't pay for it.
+        """
+        if lang_codes is None:
+            lang_codes = [*self.nltk_supported_languages, "ja", "zh-hans"]
+
+        for lang_code in lang_codes:
+            if lang_code in self.nltk_supported_languages:
+                sent_tokenize("", language=self.nltk_lang_map[lang_code])
+            elif lang_code == "ja":
+                with _tagger_lock:
+                    self._get_japanese_tagger()
+            elif lang_code in ["zh-hans", "zh-hant"]:
+                jieba.initialize()
+
     def _split_sentences_generic(self, text):
         terminators = "".join(self.terminators)
         pattern = rf"(?<=[{terminators}])\s+"
         return re.split(pattern, text.strip())
 
     def _split_sentences_japanese(self, text):
-        tagger = Tagger()
-
         sentences = []
-        nodes = tagger(text)
         sentence = ""
 
-        for node in nodes:
-            if node.surface in self.ja_zh_terminators:
-                sentence += node.surface
-                if sentence:
-                    sentences.append(sentence.strip())
-                    sentence = ""
-            else:
-                sentence += node.surface
+        # Nodes point into the tagger's buffers, so read them under the lock
+        with _tagger_lock:
+            nodes = self._get_japanese_tagger()(text)
+
+            for node in nodes:
+                if node.surface in self.ja_zh_terminators:
+                    sentence += node.surface
+                    if sentence:
+                        sentences.append(sentence.strip())
+                        sentence = ""
+                else:
+                    sentence += node.surface
         return sentences
 
     def _split_sentences_chinese(self, text):
@@ -96,3 +133,17 @@ class SentenceSplitter:
         if lang_code in ["zh-hans", "zh-hant"]:
             return self._split_sentences_chinese(text)
         return self._split_sentences_generic(text)
+
+
+def warm_up_sentence_splitter():
+    """
+    Boot hook for WSGI/ASGI/Celery processes, enabled with the
+    SENTENCE_SPLITTER_WARM_UP setting.
+    """
+    if not settings.SENTENCE_SPLITTER_WARM_UP:
+        return
+
+    try:
+        SentenceSplitter().warm_up()
+    except Exception:
+        logger.exception("Failed to warm up the sentence splitter tokenizers.")
@@ -9,6 +9,7 @@ from django.shortcuts import get_object_or_404
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView
 from django.views.generic import DeleteView
@@ -17,21 +18,23 @@ from django.views.generic import ListView
 from django.views.generic import TemplateView
 from django.views.generic import UpdateView
 
-from langcorrect.contributions.helpers import update_user_writing_streak
+from langcorrect.contributions.helpers import increment_user_writing_streak
 from langcorrect.corrections.helpers import get_post_user_corrections
 from langcorrect.corrections.helpers import get_top_correctors
 from langcorrect.languages.models import LanguageLevel
 from langcorrect.posts.forms import CustomPostForm
+from langcorrect.posts.helpers import annotate_is_corrected_by_viewer
 from langcorrect.posts.helpers import check_can_create_post
 from langcorrect.posts.helpers import get_post_counts_by_language
 from langcorrect.posts.models import Post
 from langcorrect.posts.models import PostImage
 from langcorrect.posts.models import PostVisibility
 from langcorrect.prompts.models import Prompt
+from langcorrect.utils.pagination import CursorPaginationMixin
 from langcorrect.utils.storages import get_storage_backend
 
 
-class PostListView(ListView):
+class PostListView(CursorPaginationMixin, ListView):
     model = Post
     slug_field = "slug"
     slug_url_kwarg = "slug"
@@ -53,6 +56,13 @@ class PostListView(ListView):
     def get_lang_code(self):
         return self.request.GET.get("lang_code", None)
 
+    def get_ordering(self):
+        lang_code = self.get_lang_code()
+
+        if lang_code and lang_code != "all":
+            return ("is_corrected", *super().get_ordering())
+        return super().get_ordering()
+
     def get_queryset(self):
         qs = (
             super()
@@ -67,6 +77,7 @@ class PostListView(ListView):
             .prefetch_related(
                 "postimage_set",
                 "tags",
+                "user__languagelevel_set",
             )
         )
 
@@ -75,6 +86,8 @@ class PostListView(ListView):
         if current_user.is_anonymous:
             return qs.filter(permission=PostVisibility.PUBLIC, is_corrected=True)
 
+        qs = annotate_is_corrected_by_viewer(qs, current_user)
+
         mode = self.get_mode()
         lang_code = self.get_lang_code()
 
@@ -82,17 +95,14 @@ class PostListView(ListView):
             qs = qs.filter(user__in=current_user.get_following_users_ids)
         elif mode == "learn":
             qs = qs.filter(
-                language__in=current_user.studying_languages,
+                language_id__in=current_user.studying_language_ids,
                 is_corrected=True,
             ).exclude(user=current_user)
         else:
-            qs = qs.filter(language__in=current_user.native_languages)
+            qs = qs.filter(language_id__in=current_user.native_language_ids)
 
         if lang_code and lang_code != "all":
-            qs = qs.filter(language__code=lang_code).order_by(
-                "is_corrected",
-                "-created",
-            )
+            qs = qs.filter(language__code=lang_code)
 
         return qs
 
@@ -109,10 +119,12 @@ class PostListView(ListView):
             language_filter_choices = get_post_counts_by_language(
                 current_user.studying_languages,
                 corrected=True,
+                cached=True,
             )
         elif mode == "teach" and current_user.is_authenticated:
             language_filter_choices = get_post_counts_by_language(
                 current_user.native_languages,
+                cached=True,
             )
 
         context.update(
@@ -141,6 +153,12 @@ class PostDetailView(DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_queryset(self):
+        return annotate_is_corrected_by_viewer(
+            super().get_queryset(),
+            self.request.user,
+        )
+
     def get_object(self, queryset=None):
         obj = super().get_object(queryset=queryset)
 
@@ -233,7 +251,10 @@ class PostCreateView(LoginRequiredMixin, SuccessMessageMixin, CreateView):
                 file_key=file_key,
             )
 
-        update_user_writing_streak(self.object.user)
+        increment_user_writing_streak(
+            self.object.user,
+            post_date=timezone.localdate(self.object.created),
+        )
 
         return HttpResponseRedirect(self.get_success_url())
 
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.20 on 2026-10-18 19:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def deduplicate_slugs(apps, schema_editor):
+    Prompt = apps.get_model('prompts', 'Prompt')
+
+    duplicate_slugs = (
+        Prompt.objects.filter(slug__isnull=False)
+        .order_by()
+        .values('slug')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .values_list('slug', flat=True)
+    )
+    for slug in duplicate_slugs:
+        # The oldest row keeps the slug
+        for obj in Prompt.objects.filter(slug=slug).order_by('id')[1:]:
+            obj.slug = f'{slug}-{obj.id}'
+            obj.save(update_fields=['slug'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prompts', '0003_prompt_uuid'),
+    ]
+
+    operations = [
+        migrations.RunPython(deduplicate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='prompt',
+            name='slug',
+            field=models.SlugField(max_length=255, null=True, unique=True),
+        ),
+    ]
@@ -2,16 +2,24 @@
 import random
 import string
 import uuid
+from functools import partial
 
 from django.conf import settings
 from django.db import models
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.urls import reverse
+from django.utils import timezone
 from model_utils.models import SoftDeletableModel
 from model_utils.models import TimeStampedModel
 from taggit.managers import TaggableManager
 
+from langcorrect.contributions.models import adjust_daily_contributions
 from langcorrect.languages.models import Language
 from langcorrect.languages.models import LevelChoices
+from langcorrect.utils.slugs import save_with_unique_slug
 
 
 class Prompt(SoftDeletableModel, TimeStampedModel):
@@ -27,7 +35,7 @@ class Prompt(SoftDeletableModel, TimeStampedModel):
         blank=True,
     )
     language = models.ForeignKey(Language, on_delete=models.CASCADE)
-    slug = models.SlugField(max_length=255, null=True)
+    slug = models.SlugField(max_length=255, null=True, unique=True)
     tags = TaggableManager(blank=True)
     challenge = models.ForeignKey(
         "challenges.Challenge",
@@ -37,20 +45,33 @@ class Prompt(SoftDeletableModel, TimeStampedModel):
     )
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
 
-    def create_hash(self):
-        def get_random_str():
-            return "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    # Whether the prompt is in its author's daily prompt count, None when
+    # is_removed was deferred and the count can't be followed
+    counted = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "is_removed" in instance.get_deferred_fields():
+            instance.counted = None
+        else:
+            instance.counted = not instance.is_removed
+        return instance
 
-        slug = get_random_str()
-        while Prompt.objects.filter(slug=slug).exists():
-            slug = get_random_str()
-        return slug
+    def create_hash(self):
+        return "".join(random.choices(string.ascii_uppercase + string.digits, k=6))
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = self.create_hash()
+            # Random slugs rarely collide, the unique constraint catches it
+            return save_with_unique_slug(
+                self,
+                Prompt.all_objects,
+                self.create_hash,
+                partial(super().save, *args, **kwargs),
+            )
 
-        super().save(*args, **kwargs)
+        return super().save(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("prompts:detail", kwargs={"slug": self.slug})
@@ -58,3 +79,35 @@ class Prompt(SoftDeletableModel, TimeStampedModel):
     @property
     def response_count(self):
         return self.post_set.all().count()
+
+
+def _schedule_daily_prompt_count_update(prompt, delta):
+    transaction.on_commit(
+        partial(
+            adjust_daily_contributions,
+            prompt.user_id,
+            "prompt_count",
+            {timezone.localdate(prompt.created): delta},
+        ),
+    )
+
+
+# Creating, soft deleting, restoring and deleting prompts move them in and out
+# of the author's daily prompt count
+@receiver(post_save, sender=Prompt)
+def update_daily_prompt_count(sender, instance, created, **kwargs):
+    if instance.counted is None:
+        # Loaded with deferred fields; reconciliation will pick it up
+        return
+
+    counted = not instance.is_removed
+    if counted != instance.counted:
+        _schedule_daily_prompt_count_update(instance, 1 if counted else -1)
+    instance.counted = counted
+
+
+@receiver(post_delete, sender=Prompt)
+def decrement_daily_prompt_count(sender, instance, **kwargs):
+    if instance.counted:
+        _schedule_daily_prompt_count_update(instance, -1)
+    instance.counted = False
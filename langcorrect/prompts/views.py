@@ -13,6 +13,7 @@ from django.views.generic import ListView
 
 from langcorrect.languages.models import Language
 from langcorrect.posts.forms import CustomPostForm
+from langcorrect.posts.helpers import annotate_is_corrected_by_viewer
 from langcorrect.prompts.forms import CustomPromptForm
 from langcorrect.prompts.models import Prompt
 
@@ -32,7 +33,13 @@ class PromptListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         current_user = self.request.user
 
-        qs = super().get_queryset().filter(language__in=current_user.all_languages)
+        qs = (
+            super()
+            .get_queryset()
+            .filter(
+                language_id__in=current_user.all_language_ids,
+            )
+        )
 
         mode = self.get_mode()
         lang_code = self.get_lang_code()
@@ -82,7 +89,10 @@ class PromptDetailView(LoginRequiredMixin, DetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        prompt_responses = self.get_object().post_set.all()
+        prompt_responses = annotate_is_corrected_by_viewer(
+            self.get_object().post_set.all(),
+            self.request.user,
+        )
 
         response_languages = list(
             prompt_responses.values_list("language__code", flat=True)
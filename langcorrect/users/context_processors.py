@@ -6,3 +6,12 @@ def allauth_settings(request):
     return {
         "ACCOUNT_ALLOW_REGISTRATION": settings.ACCOUNT_ALLOW_REGISTRATION,
     }
+
+
+def unread_notification_count(request):
+    """Expose the user's unread notification counter, saving a COUNT per page."""
+    user = getattr(request, "user", None)
+
+    if user is None or not user.is_authenticated:
+        return {"unread_notification_count": 0}
+    return {"unread_notification_count": user.unread_notification_count}
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.20 on 2026-10-18 20:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_unread_notification_counts(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Notification = apps.get_model('notifications', 'Notification')
+
+    unread_counts = (
+        Notification.objects.filter(recipient=OuterRef('pk'), unread=True)
+        .order_by()
+        .values('recipient')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    User.objects.update(unread_notification_count=Coalesce(Subquery(unread_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+        ('users', '0005_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notification_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_unread_notification_counts, migrations.RunPython.noop),
+    ]
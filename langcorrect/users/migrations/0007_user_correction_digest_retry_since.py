@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 21:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_user_unread_notification_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='correction_digest_retry_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,20 +1,26 @@
 # ruff: noqa: DJ001
 import uuid
+from collections import defaultdict
 
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import UserManager
 from django.core.exceptions import PermissionDenied
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from config.settings.base import AVATAR_BASE_URL
 from langcorrect.contributions.models import Contribution
 from langcorrect.corrections.models import PostCorrection
 from langcorrect.languages.models import Language
+from langcorrect.languages.models import LanguageLevel
 from langcorrect.languages.models import LevelChoices
 
 CANNOT_DELETE_SYSTEM_USER_ERR_MSG = "System user cannot be deleted."
@@ -59,6 +65,11 @@ class User(AbstractUser):
     is_max_studying = models.BooleanField(default=False)
     is_system = models.BooleanField(default=False)
     uuid = models.UUIDField(null=True, blank=True, default=uuid.uuid4, editable=False)
+    # Read by the navbar on every page, see adjust_unread_notification_counts
+    unread_notification_count = models.PositiveIntegerField(default=0)
+    # Start of the correction digest that failed to send, retried by the next
+    # run of send_correction_digests_task
+    correction_digest_retry_since = models.DateTimeField(null=True, blank=True)
 
     objects = ActiveUserManager()
     all_objects = AllUserManager()
@@ -102,25 +113,55 @@ class User(AbstractUser):
     def followers_users(self):
         return User.objects.filter(follower__follow_to=self)
 
+    @cached_property
+    def language_levels(self):
+        """
+        {language_id: level} for the user's languages. Cached on the instance,
+        so it is resolved once per request for request.user. Uses prefetched
+        languagelevel_set rows when available.
+        """
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "languagelevel_set" in prefetched:
+            return {
+                language_level.language_id: language_level.level
+                for language_level in prefetched["languagelevel_set"]
+            }
+        return dict(self.languagelevel_set.values_list("language_id", "level"))
+
+    def clear_language_cache(self):
+        self.__dict__.pop("language_levels", None)
+
+    @property
+    def native_language_ids(self):
+        return frozenset(
+            language_id
+            for language_id, level in self.language_levels.items()
+            if level == LevelChoices.NATIVE
+        )
+
+    @property
+    def studying_language_ids(self):
+        return frozenset(
+            language_id
+            for language_id, level in self.language_levels.items()
+            if level != LevelChoices.NATIVE
+        )
+
+    @property
+    def all_language_ids(self):
+        return frozenset(self.language_levels)
+
     @property
     def native_languages(self):
-        lang_codes = self.languagelevel_set.filter(
-            level=LevelChoices.NATIVE,
-        ).values_list("language__code", flat=True)
-        return Language.objects.filter(code__in=lang_codes)
+        return Language.objects.filter(id__in=self.native_language_ids)
 
     @property
     def studying_languages(self):
-        lang_codes = (
-            self.languagelevel_set.filter(user=self)
-            .exclude(level=LevelChoices.NATIVE)
-            .values_list("language__code", flat=True)
-        )
-        return Language.objects.filter(code__in=lang_codes)
+        return Language.objects.filter(id__in=self.studying_language_ids)
 
     @property
     def all_languages(self):
-        return self.native_languages | self.studying_languages
+        return Language.objects.filter(id__in=self.all_language_ids)
 
     @property
     def corrections_made_count(self):
@@ -169,3 +210,43 @@ class User(AbstractUser):
 def create_contribution_user(sender, instance, created, **kwargs):
     if created:
         Contribution.objects.create(user=instance)
+
+
+@receiver(post_save, sender=LanguageLevel)
+@receiver(post_delete, sender=LanguageLevel)
+def clear_user_language_cache(sender, instance, **kwargs):
+    if LanguageLevel.user.is_cached(instance):
+        instance.user.clear_language_cache()
+
+
+def adjust_unread_notification_counts(deltas):
+    """
+    Applies {user_id: delta} to the users' unread notification counters with
+    one UPDATE per distinct delta. Counters never go below zero, and drift
+    (e.g. from the notifications app's own views) is fixed periodically by
+    reconcile_unread_notification_counts.
+    """
+    user_ids_by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            user_ids_by_delta[delta].append(user_id)
+
+    for delta, user_ids in user_ids_by_delta.items():
+        User.all_objects.filter(id__in=user_ids).update(
+            unread_notification_count=Greatest(
+                F("unread_notification_count") + delta,
+                0,
+            ),
+        )
+
+
+@receiver(post_save, sender="notifications.Notification")
+def increment_unread_notification_count(sender, instance, created, **kwargs):
+    if created and instance.unread:
+        adjust_unread_notification_counts({instance.recipient_id: 1})
+
+
+@receiver(post_delete, sender="notifications.Notification")
+def decrement_unread_notification_count(sender, instance, **kwargs):
+    if instance.unread:
+        adjust_unread_notification_counts({instance.recipient_id: -1})
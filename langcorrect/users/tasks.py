@@ -1,6 +1,20 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
 
 from config import celery_app
+from langcorrect.helpers import NOTIFICATION_VERBS
+from langcorrect.helpers import bulk_create_notifications
+from langcorrect.helpers import compact_notifications
+from langcorrect.helpers import delete_old_notifications
+from langcorrect.helpers import reconcile_unread_notification_counts
+
+logger = logging.getLogger(__name__)
 
 User = get_user_model()
 
@@ -9,3 +23,67 @@ User = get_user_model()
 def get_users_count():
     """A pointless Celery task to demonstrate usage."""
     return User.objects.count()
+
+
+@celery_app.task()
+def reconcile_unread_notification_counts_task():
+    """
+    Fixes unread notification counters that drifted from the notifications.
+    Returns the number of users fixed. Scheduled nightly through
+    CELERY_BEAT_SCHEDULE.
+    """
+    return reconcile_unread_notification_counts()
+
+
+@celery_app.task()
+def create_notifications_task(
+    sender_id,
+    recipient_ids,
+    action_object_content_type_id,
+    action_object_id,
+    n_type,
+):
+    """
+    Creates notifications deferred by create_notification. Returns the number
+    of notifications created, 0 if the sender or the action object is gone.
+    """
+    sender = User.all_objects.filter(id=sender_id).first()
+    content_type = ContentType.objects.get_for_id(action_object_content_type_id)
+
+    try:
+        action_object = content_type.get_object_for_this_type(pk=action_object_id)
+    except ObjectDoesNotExist:
+        action_object = None
+
+    if sender is None or action_object is None:
+        return 0
+
+    return bulk_create_notifications(
+        sender=sender,
+        recipient_ids=recipient_ids,
+        verb=NOTIFICATION_VERBS[n_type],
+        action_object=action_object,
+        n_type=n_type,
+    )
+
+
+@celery_app.task()
+def prune_notifications_task(batch_size=500):
+    """
+    Compacts old read notifications and deletes expired ones, see
+    NOTIFICATION_COMPACTION_DAYS and NOTIFICATION_RETENTION_DAYS. Scheduled
+    nightly through CELERY_BEAT_SCHEDULE. Returns the number of rows deleted
+    by each step.
+    """
+    now = timezone.now()
+    compacted = compact_notifications(
+        now - timedelta(days=settings.NOTIFICATION_COMPACTION_DAYS),
+        batch_size=batch_size,
+    )
+    expired = delete_old_notifications(
+        now - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS),
+        batch_size=batch_size,
+    )
+
+    logger.info("Pruned notifications: %s compacted, %s expired.", compacted, expired)
+    return {"compacted": compacted, "expired": expired}
@@ -1,5 +1,67 @@
+import pytest
+from notifications.models import Notification
+from notifications.signals import notify
+
+from langcorrect.constants import NotificationTypes
+from langcorrect.helpers import bulk_create_notifications
+from langcorrect.helpers import create_notification
+from langcorrect.helpers import mark_notifications_as_read
+from langcorrect.helpers import reconcile_unread_notification_counts
 from langcorrect.users.models import User
+from langcorrect.users.tests.factories import UserFactory
 
 
 def test_user_get_absolute_url(user: User):
     assert user.get_absolute_url() == f"/users/{user.username}/"
+
+
+@pytest.mark.django_db()
+def test_unread_notification_count(user: User):
+    sender = UserFactory()
+
+    def get_count():
+        user.refresh_from_db(fields=["unread_notification_count"])
+        return user.unread_notification_count
+
+    notify.send(sender=sender, recipient=user, verb="followed you")
+    bulk_create_notifications(
+        sender=sender,
+        recipient_ids=[user.id],
+        verb="posted",
+        action_object=sender,
+        n_type=NotificationTypes.NEW_POST,
+    )
+    assert get_count() == user.notifications.unread().count()
+
+    first_notification = user.notifications.order_by("id").first()
+    assert mark_notifications_as_read(user, [first_notification.id]) == 1
+    assert get_count() == 1
+
+    user.notifications.unread().delete()
+    assert get_count() == 0
+
+    # Drift from updates that bypass the counter is reconciled
+    Notification.objects.filter(recipient=user).update(unread=True)
+    assert reconcile_unread_notification_counts() == 1
+    assert get_count() == 1
+
+    assert mark_notifications_as_read(user) == 1
+    assert get_count() == 0
+
+
+@pytest.mark.django_db()
+def test_create_notification_deduplicates_recipients(user: User):
+    sender = UserFactory()
+
+    created = create_notification(
+        sender,
+        [user, user, None],
+        sender,
+        NotificationTypes.NEW_FOLLOWER,
+    )
+
+    assert created == 1
+    notification = user.notifications.get()
+    assert notification.verb == "followed you"
+    assert notification.actor == sender
+    assert notification.data == {"notification_type": NotificationTypes.NEW_FOLLOWER}
@@ -1,7 +1,15 @@
+from datetime import timedelta
+
 import pytest
 from celery.result import EagerResult
+from django.utils import timezone
+from notifications.models import Notification
 
+from langcorrect.constants import NotificationTypes
+from langcorrect.helpers import create_notification
+from langcorrect.helpers import mark_notifications_as_read
 from langcorrect.users.tasks import get_users_count
+from langcorrect.users.tasks import prune_notifications_task
 from langcorrect.users.tests.factories import UserFactory
 
 pytestmark = pytest.mark.django_db
@@ -15,3 +23,54 @@ def test_user_count(settings):
     task_result = get_users_count.delay()
     assert isinstance(task_result, EagerResult)
     assert task_result.result == batch_size
+
+
+def test_deferred_notifications(settings, django_capture_on_commit_callbacks):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    sender = UserFactory()
+    recipients = UserFactory.create_batch(3)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        created = create_notification(
+            sender,
+            recipients,
+            sender,
+            NotificationTypes.NEW_FOLLOWER,
+            defer=True,
+        )
+
+    assert created == 0
+    for recipient in recipients:
+        recipient.refresh_from_db()
+        assert recipient.unread_notification_count == 1
+
+
+def test_prune_notifications(settings):
+    settings.NOTIFICATION_COMPACTION_DAYS = 30
+    settings.NOTIFICATION_RETENTION_DAYS = 365
+    recipient = UserFactory()
+    correctors = UserFactory.create_batch(3)
+    follower = UserFactory()
+
+    for corrector in correctors:
+        create_notification(
+            corrector,
+            recipient,
+            recipient,
+            NotificationTypes.NEW_CORRECTION,
+        )
+    mark_notifications_as_read(recipient)
+    Notification.objects.update(timestamp=timezone.now() - timedelta(days=60))
+
+    create_notification(follower, recipient, follower, NotificationTypes.NEW_FOLLOWER)
+    Notification.objects.filter(verb="followed you").update(
+        timestamp=timezone.now() - timedelta(days=400),
+    )
+
+    assert prune_notifications_task(batch_size=1) == {"compacted": 2, "expired": 1}
+
+    notification = recipient.notifications.get()
+    assert notification.actor == correctors[-1]
+    assert notification.data["others_count"] == len(correctors) - 1
+    recipient.refresh_from_db()
+    assert recipient.unread_notification_count == 0
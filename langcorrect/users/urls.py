@@ -2,6 +2,8 @@ from django.urls import path
 
 from langcorrect.follows.views import follower_list_view
 from langcorrect.follows.views import following_list_view
+from langcorrect.users.views import mark_all_notifications_as_read_view
+from langcorrect.users.views import mark_notification_as_read_view
 from langcorrect.users.views import notifications_view
 from langcorrect.users.views import user_delete_view
 from langcorrect.users.views import user_detail_view
@@ -14,6 +16,16 @@ urlpatterns = [
     path("~update/", view=user_update_view, name="update"),
     path("~delete/", view=user_delete_view, name="delete"),
     path("~notifications/", view=notifications_view, name="notifications"),
+    path(
+        "~notifications/mark-all-as-read/",
+        view=mark_all_notifications_as_read_view,
+        name="mark_all_notifications_as_read",
+    ),
+    path(
+        "~notifications/mark-as-read/<int:slug>/",
+        view=mark_notification_as_read_view,
+        name="mark_notification_as_read",
+    ),
     path("<str:username>/", view=user_detail_view, name="detail"),
     path("<str:username>/followers/", view=follower_list_view, name="followers"),
     path("<str:username>/following/", view=following_list_view, name="following"),
@@ -1,7 +1,6 @@
 # ruff: noqa: PLR0911
 
 import logging
-from datetime import datetime
 
 from django.contrib import messages
 from django.contrib.auth import get_user_model
@@ -12,14 +11,17 @@ from django.db import transaction
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.urls import reverse
-from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import DetailView
 from django.views.generic import ListView
 from django.views.generic import RedirectView
 from django.views.generic import UpdateView
+from notifications.utils import slug2id
 
-from langcorrect.corrections.models import PostCorrection
+from langcorrect.contributions.helpers import get_yearly_contribution_count
+from langcorrect.helpers import mark_notifications_as_read
+from langcorrect.posts.helpers import annotate_is_corrected_by_viewer
 from langcorrect.subscriptions.exceptions import MissingSubscriptionIdError
 from langcorrect.subscriptions.exceptions import SubscriptionCancellationError
 from langcorrect.users.exceptions import MissingSystemUserError
@@ -50,32 +52,15 @@ class UserDetailView(LoginRequiredMixin, DetailView):
         context = super().get_context_data(**kwargs)
         user = self.get_object()
 
-        now = timezone.now()
-        start_date = timezone.make_aware(datetime(now.year, 1, 1))  # noqa: DTZ001
-        end_date = timezone.make_aware(datetime(now.year, 12, 31, 23, 59, 59))  # noqa: DTZ001
-
         language_levels_ordered = user.languagelevel_set.order_by("-level")
-        post_this_year_count = user.post_set.filter(
-            created__range=(start_date, end_date),
-        ).count()
-
-        corrections_this_year_count = PostCorrection.available_objects.filter(
-            user_correction__user=user,
-            created__range=(start_date, end_date),
-        ).count()
-
-        prompts_this_year_count = user.prompt_set.filter(
-            created__range=(start_date, end_date),
-        ).count()
-
-        total_contributions = (
-            post_this_year_count + corrections_this_year_count + prompts_this_year_count
-        )
 
         context.update(
             {
-                "totalContributions": total_contributions,
-                "posts": user.post_set.all()[:10],
+                "totalContributions": get_yearly_contribution_count(user),
+                "posts": annotate_is_corrected_by_viewer(
+                    user.post_set.all(),
+                    self.request.user,
+                )[:10],
                 "is_following": self.request.user in user.followers_users,
                 "languages": language_levels_ordered,
             },
@@ -127,6 +112,30 @@ class NotificationsViewList(LoginRequiredMixin, ListView):
 notifications_view = NotificationsViewList.as_view()
 
 
+def _redirect_to_next(request):
+    next_url = request.GET.get("next")
+
+    if next_url and url_has_allowed_host_and_scheme(
+        next_url,
+        allowed_hosts={request.get_host()},
+        require_https=request.is_secure(),
+    ):
+        return redirect(next_url)
+    return redirect(reverse("users:notifications"))
+
+
+@login_required
+def mark_notification_as_read_view(request, slug):
+    mark_notifications_as_read(request.user, [slug2id(slug)])
+    return _redirect_to_next(request)
+
+
+@login_required
+def mark_all_notifications_as_read_view(request):
+    mark_notifications_as_read(request.user)
+    return _redirect_to_next(request)
+
+
 @login_required
 def user_delete_view(request):
     """
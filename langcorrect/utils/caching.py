@@ -0,0 +1,134 @@
+import logging
+import math
+import random
+import time
+from functools import partial
+from typing import Any
+from typing import NamedTuple
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_LOCK_TIMEOUT = 60
+CACHE_LOCK_WAIT = 2
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    # Unix timestamp after which the value is stale
+    expires_at: float
+    # Seconds the last computation took, used for probabilistic early expiry
+    delta: float
+
+
+def get_cached(  # noqa: PLR0913
+    key,
+    compute,
+    timeout,
+    stale_timeout=None,
+    beta=1.0,
+    refresh_async=None,
+):
+    """
+    Returns the cached value for key, calling compute() to rebuild it.
+
+    - Single flight: only the caller that takes the key's lock recomputes the
+      value, concurrent callers serve the stale value or briefly wait for it.
+    - Probabilistic early expiry: a value is occasionally refreshed before it
+      expires, more often the closer it is to expiring and the slower it is to
+      compute (beta scales this, 0 disables it).
+    - Stale while revalidate: values are kept for stale_timeout seconds after
+      they expire (defaults to timeout) and served while being refreshed. If
+      refresh_async is given, it is called instead of compute() to refresh the
+      value in the background (e.g. a Celery task's delay) and must end up
+      calling refresh_cached.
+
+    Args:
+        key (str): the cache key
+        compute (Callable): returns the value to cache
+        timeout (int): seconds the value is fresh for
+        stale_timeout (int): seconds a stale value can still be served for
+        beta (float): how eagerly values are refreshed before they expire
+        refresh_async (Callable): schedules refresh_cached for this key
+
+    Returns:
+        the cached or freshly computed value
+    """
+    entry = cache.get(key)
+
+    if isinstance(entry, CacheEntry):
+        # XFetch, see "Optimal Probabilistic Cache Stampede Prevention"
+        jitter = -entry.delta * beta * math.log(1 - random.random())  # noqa: S311
+        if time.time() + jitter < entry.expires_at:
+            return entry.value
+
+        return _revalidate(
+            key,
+            entry.value,
+            partial(refresh_cached, key, compute, timeout, stale_timeout),
+            refresh_async=refresh_async,
+        )
+
+    if _acquire_lock(key):
+        return refresh_cached(key, compute, timeout, stale_timeout)
+
+    # Someone else is computing the value, wait for it rather than piling on
+    deadline = time.monotonic() + CACHE_LOCK_WAIT
+    while time.monotonic() < deadline and cache.get(_get_lock_key(key)):
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+
+        entry = cache.get(key)
+        if isinstance(entry, CacheEntry):
+            return entry.value
+
+    return compute()
+
+
+def refresh_cached(key, compute, timeout, stale_timeout=None):
+    """
+    Recomputes and stores the value for key, releasing the key's lock. Used by
+    get_cached and by background refreshes scheduled through refresh_async.
+    """
+    if stale_timeout is None:
+        stale_timeout = timeout
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        delta = time.monotonic() - started
+
+        cache.set(
+            key,
+            CacheEntry(value, time.time() + timeout, delta),
+            timeout=timeout + stale_timeout,
+        )
+    finally:
+        cache.delete(_get_lock_key(key))
+
+    logger.debug("Refreshed cache key %s in %.3fs", key, delta)
+    return value
+
+
+def _revalidate(key, stale_value, refresh, refresh_async=None):
+    """
+    Refreshes a stale value if no one else is already doing it. Returns the
+    stale value unless it was refreshed synchronously.
+    """
+    if not _acquire_lock(key):
+        return stale_value
+
+    if refresh_async is not None:
+        refresh_async()
+        return stale_value
+
+    return refresh()
+
+
+def _get_lock_key(key):
+    return f"{key}:lock"
+
+
+def _acquire_lock(key):
+    return bool(cache.add(_get_lock_key(key), 1, timeout=CACHE_LOCK_TIMEOUT))
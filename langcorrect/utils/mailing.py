@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
+from django.core.mail import get_connection
 from django.template.loader import render_to_string
 
 
@@ -22,53 +23,129 @@ class EmailSender:
         """
         return render_to_string(template_name, context)
 
-    def send_email(self, subject, template_name, context, recipient_list):
+    def build_email(self, subject, template_name, context, recipient_list):
         """
-        Send an email with content rendered from a Django template.
+        Build an email with content rendered from a Django template.
 
         :param subject: Email subject
         :param template_name: Path to the email template
         :param context: Dictionary with template variables
         :param recipient_list: List of recipients
+        :return: EmailMultiAlternatives
         """
         html_content = self._render_template(template_name, context)
 
+        msg = EmailMultiAlternatives(
+            subject=subject,
+            body=html_content,
+            from_email=self.from_email,
+            to=recipient_list,
+        )
+        msg.attach_alternative(html_content, "text/html")
+        return msg
+
+    def _capture_exception(self, e):
+        if not settings.DEBUG:
+            from sentry_sdk import capture_exception
+
+            capture_exception(e)
+
+    def send_emails(self, messages):
+        """
+        Send the given emails over a single connection. An email that fails
+        doesn't stop the ones after it.
+
+        :param messages: List of EmailMultiAlternatives
+        :return: List of the emails that were sent
+        """
+        sent = []
+
+        if not messages:
+            return sent
+
         try:
-            msg = EmailMultiAlternatives(
-                subject=subject,
-                body=html_content,
-                from_email=self.from_email,
-                to=recipient_list,
-            )
-            msg.attach_alternative(html_content, "text/html")
-            msg.send()
+            with get_connection() as connection:
+                for message in messages:
+                    try:
+                        if connection.send_messages([message]):
+                            sent.append(message)
+                    except Exception as e:  # noqa: BLE001
+                        self._capture_exception(e)
         except Exception as e:  # noqa: BLE001
-            if not settings.DEBUG:
-                from sentry_sdk import capture_exception
+            # Opening or closing the connection failed
+            self._capture_exception(e)
 
-                capture_exception(e)
+        return sent
 
+    def send_email(self, subject, template_name, context, recipient_list):
+        """
+        Send an email with content rendered from a Django template.
 
-def email_new_correction(post):
+        :param subject: Email subject
+        :param template_name: Path to the email template
+        :param context: Dictionary with template variables
+        :param recipient_list: List of recipients
+        """
+        self.send_emails(
+            [self.build_email(subject, template_name, context, recipient_list)],
+        )
+
+
+def build_new_correction_email(post, sender=None):
     """
-    Send a new correction received email.
+    Build a new correction received email.
 
     :param post: Post object
+    :param sender: EmailSender, to share it between emails
+    :return: EmailMultiAlternatives
     """
-
     user = post.user
-    email = user.email
-    subject = "[LangCorrect] New Correction!"
+    sender = sender or EmailSender()
 
-    context = {
-        "username": user.display_name,
-        "post_link": f"{settings.SITE_BASE_URL}{post.get_absolute_url()}",
-    }
-
-    msg = EmailSender()
-    msg.send_email(
-        subject=subject,
+    return sender.build_email(
+        subject="[LangCorrect] New Correction!",
         template_name="emails/new_correction.html",
-        context=context,
-        recipient_list=[email],
+        context={
+            "username": user.display_name,
+            "post_link": f"{settings.SITE_BASE_URL}{post.get_absolute_url()}",
+        },
+        recipient_list=[user.email],
     )
+
+
+def build_correction_digest_email(user, corrected_posts, sender=None):
+    """
+    Build an email listing the posts of the user corrected since the last one.
+
+    :param user: User object
+    :param corrected_posts: List of (post, corrector names) tuples
+    :param sender: EmailSender, to share it between emails
+    :return: EmailMultiAlternatives
+    """
+    sender = sender or EmailSender()
+
+    return sender.build_email(
+        subject="[LangCorrect] New Corrections!",
+        template_name="emails/correction_digest.html",
+        context={
+            "username": user.display_name,
+            "posts": [
+                {
+                    "title": post.title,
+                    "post_link": f"{settings.SITE_BASE_URL}{post.get_absolute_url()}",
+                    "correctors": correctors,
+                }
+                for post, correctors in corrected_posts
+            ],
+        },
+        recipient_list=[user.email],
+    )
+
+
+def email_new_correction(post):
+    """
+    Send a new correction received email.
+
+    :param post: Post object
+    """
+    EmailSender().send_emails([build_new_correction_email(post)])
@@ -0,0 +1,180 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.http import Http404
+from django.utils.translation import gettext_lazy as _
+
+
+class CursorPage:
+    """The page of a CursorPaginator, a subset of Django's Page API."""
+
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginates a queryset by keyset instead of OFFSET: a page holds the rows
+    that sort right after the last row of the previous page. Deep pages cost
+    the same as the first one (given an index matching the ordering) and
+    nothing is counted, so there are no page numbers.
+
+    Cursors are opaque strings holding the ordering values of the row the
+    page starts after, or before for previous pages.
+
+    Args:
+        queryset (QuerySet): the rows to paginate
+        per_page (int): the number of rows per page
+        ordering (tuple[str]): model fields, the last of which must be unique
+    """
+
+    is_cursor = True
+
+    def __init__(self, queryset, per_page, ordering=("-created", "-id")) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [
+            queryset.model._meta.get_field(field_name.lstrip("-"))  # noqa: SLF001
+            for field_name in self.ordering
+        ]
+
+    def encode_cursor(self, obj, *, reverse=False) -> str:
+        values = [field.value_to_string(obj) for field in self.fields]
+        payload = json.dumps([values, reverse], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor) -> tuple[list, bool]:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values, reverse = json.loads(payload)
+            if len(values) != len(self.fields):
+                raise ValueError  # noqa: TRY301
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values, strict=True)
+            ]
+        except (TypeError, ValueError, ValidationError) as e:
+            raise InvalidPage(_("That cursor is not valid")) from e
+
+        return values, bool(reverse)
+
+    def get_seek_filter(self, ordering, values) -> Q:
+        """
+        Matches the rows after values in the given ordering, i.e. the row
+        comparison (a, b, c) > (x, y, z) with a direction per field.
+        """
+        seek_filter = Q()
+
+        for i, field_name in enumerate(ordering):
+            lookup = "lt" if field_name.startswith("-") else "gt"
+            condition = {
+                previous_name.lstrip("-"): value
+                for previous_name, value in zip(ordering[:i], values, strict=False)
+            }
+            condition[f"{field_name.lstrip('-')}__{lookup}"] = values[i]
+            seek_filter |= Q(**condition)
+
+        return seek_filter
+
+    def get_page(self, cursor=None) -> CursorPage:
+        values, reverse = self.decode_cursor(cursor) if cursor else (None, False)
+
+        ordering = self.ordering
+        if reverse:
+            # Previous pages are read backwards from the cursor then flipped
+            ordering = tuple(
+                name[1:] if name.startswith("-") else f"-{name}" for name in ordering
+            )
+
+        queryset = self.queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.get_seek_filter(ordering, values))
+
+        object_list = list(queryset[: self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+
+        if reverse:
+            object_list.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        if not object_list:
+            return CursorPage(object_list, self)
+
+        return CursorPage(
+            object_list,
+            self,
+            next_cursor=self.encode_cursor(object_list[-1]) if has_next else None,
+            previous_cursor=(
+                self.encode_cursor(object_list[0], reverse=True)
+                if has_previous
+                else None
+            ),
+        )
+
+
+class CursorPaginationMixin:
+    """
+    Opt-in cursor pagination for ListViews, see CursorPaginator. It is used
+    when the CURSOR_PAGINATION setting is on or a cursor is given in the
+    "cursor" GET parameter, and pagination.html then renders previous and next
+    links instead of page numbers.
+
+    The view's ordering is the keyset, so its last field must be unique.
+    """
+
+    ordering = ("-created", "-id")
+    cursor_kwarg = "cursor"
+
+    def use_cursor_pagination(self):
+        return settings.CURSOR_PAGINATION or self.cursor_kwarg in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination():
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = CursorPaginator(queryset, page_size, ordering=self.get_ordering())
+
+        try:
+            page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as e:
+            raise Http404(_("Invalid page: %(message)s") % {"message": str(e)}) from e
+
+        return (paginator, page, page.object_list, page.has_other_pages())
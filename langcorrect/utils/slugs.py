@@ -0,0 +1,78 @@
+import re
+
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import BigIntegerField
+from django.db.models import Case
+from django.db.models import Max
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.functions import Cast
+from django.db.models.functions import Substr
+
+SLUG_MAX_ATTEMPTS = 5
+# Room left in the slug field for the numeric suffix, e.g. "-123456789"
+SLUG_SUFFIX_MAX_LENGTH = 10
+
+
+def get_next_slug(queryset, base_slug: str, max_length: int = 255) -> str:
+    """
+    Returns base_slug if it is free, otherwise base_slug with the next free
+    numeric suffix, e.g. "my-day-3" if "my-day-2" is the highest one taken.
+    An empty base_slug always gets a suffix.
+
+    This is a single query: a prefix scan over the slug index narrowed down to
+    base_slug and its "-<number>" variants.
+
+    Args:
+        queryset (QuerySet): all the rows the slug must be unique among
+        base_slug (str): "my-day"
+        max_length (int): the max length of the slug field
+
+    Returns:
+        str: "my-day-3"
+    """
+    base_slug = base_slug[: max_length - SLUG_SUFFIX_MAX_LENGTH]
+    max_suffix = queryset.filter(
+        slug__startswith=base_slug,
+        slug__regex=rf"^{re.escape(base_slug)}(-[0-9]{{1,9}})?$",
+    ).aggregate(
+        max_suffix=Max(
+            Case(
+                When(slug=base_slug, then=Value(0, output_field=BigIntegerField())),
+                default=Cast(Substr("slug", len(base_slug) + 2), BigIntegerField()),
+            ),
+        ),
+    )["max_suffix"]
+
+    if max_suffix is None and base_slug:
+        return base_slug
+    return f"{base_slug}-{(max_suffix or 0) + 1}"
+
+
+def save_with_unique_slug(instance, queryset, get_slug, save):
+    """
+    Sets instance.slug to get_slug() and calls save(). The slug column has a
+    unique constraint, so if a concurrent save takes the same slug first the
+    save is rolled back to a savepoint and retried with a new slug.
+
+    Args:
+        instance (Model): the instance being saved
+        queryset (QuerySet): all the rows the slug must be unique among
+        get_slug (Callable): returns a candidate slug
+        save (Callable): saves the instance, e.g. super().save
+    """
+    for attempt in range(1, SLUG_MAX_ATTEMPTS + 1):
+        instance.slug = get_slug()
+
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            # Only retry conflicts on the slug, not other integrity errors
+            if attempt == SLUG_MAX_ATTEMPTS or not (
+                queryset.filter(slug=instance.slug).exists()
+            ):
+                raise
+
+    return None
@@ -0,0 +1,48 @@
+# ruff: noqa: PT009
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from langcorrect.utils.caching import CacheEntry
+from langcorrect.utils.caching import get_cached
+
+
+class TestGetCached(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.compute = mock.Mock(return_value="fresh")
+
+    def test_computes_once_while_fresh(self):
+        self.assertEqual(get_cached("key", self.compute, timeout=60), "fresh")
+        self.assertEqual(get_cached("key", self.compute, timeout=60), "fresh")
+        self.compute.assert_called_once()
+
+    def test_serves_stale_value_while_locked(self):
+        cache.set("key", CacheEntry("stale", time.time() - 1, 0))
+        cache.add("key:lock", 1)
+
+        self.assertEqual(get_cached("key", self.compute, timeout=60), "stale")
+        self.compute.assert_not_called()
+
+    def test_lock_holder_refreshes_stale_value(self):
+        cache.set("key", CacheEntry("stale", time.time() - 1, 0))
+
+        self.assertEqual(get_cached("key", self.compute, timeout=60), "fresh")
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_refreshes_in_background(self):
+        cache.set("key", CacheEntry("stale", time.time() - 1, 0))
+        refresh_async = mock.Mock()
+
+        value = get_cached(
+            "key",
+            self.compute,
+            timeout=60,
+            refresh_async=refresh_async,
+        )
+
+        self.assertEqual(value, "stale")
+        refresh_async.assert_called_once()
+        self.compute.assert_not_called()